@@ -1,37 +1,105 @@
-
-# ...existing code...
-
-
-# ...existing code...
-
-
-
-
-# ...existing code...
-
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, PlainTextResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 from pathlib import Path
-import logging, uuid, shutil
+import functools, gzip, logging, time, uuid
+import jinja2
 
 from .config import settings
 from .logging_conf import configure_logging
-from .models.api import UploadResponse, ExtractResult, ReviewPayload, SuggestQuery, SuggestResponse
+from .models.api import UploadResponse, ReviewPayload, SuggestQuery, SuggestResponse
 from .storage import UPLOADS, TEXT_DIR
-from .ocr import ocr_file
-from .parser import parse_text
 from .audit import write_audit
 from .suggest import toric_decision
+from .utils import to_float, check_range
 from .services.iol_database import get_iol_database
+from .services.calculations import IOLCalculator, IOLCalculationInput
+from .services.toric_calculator import ToricCalculator
+from .services.toric_policy import get_available_policies
 
 configure_logging()
 log = logging.getLogger(__name__)
 
-templates = Jinja2Templates(directory="templates")
+# Calculators are stateless after construction; IOLCalculator loads the IOL
+# constants JSON in __init__, so build both once per worker and reuse them.
+_iol_calculator = IOLCalculator()
+_toric_calculator = ToricCalculator()
+
+
+# The legacy /suggest result depends only on (deltaK, SIA, policy); every other
+# biometry value is a fixed default, so identical queries are served from cache.
+@functools.lru_cache(maxsize=1024)
+def _legacy_toric_result(delta_k: float, sia_magnitude: float, sia_axis: float, policy_key: str):
+    # For the legacy endpoint, we need to estimate some parameters
+    # Use reasonable defaults for suggestion purposes
+    k1 = 43.0  # Default K1
+    k2 = k1 + delta_k  # Estimate K2 from deltaK
+    k1_axis = 90  # Default steep axis
+    k2_axis = 180  # Default flat axis
+    
+    # Calculate Haigis ELP for accurate toricity ratio
+    # Create minimal biometry for Haigis ELP calculation
+    calc_input = IOLCalculationInput(
+        axial_length=23.77,  # Default AL for suggestion
+        k_avg=(k1 + k2) / 2,  # Average K
+        acd=2.83,  # Default ACD
+        target_refraction=0.0,
+        k1=k1,  # Explicit K1
+        k2=k2,  # Explicit K2
+        lt=None,  # Not required for Haigis
+        wtw=None,  # Not required for Haigis
+        cct=None  # Not required for Haigis
+    )
+    
+    haigis_result = _iol_calculator._calculate_haigis(calc_input, {})
+    elp_mm = haigis_result.formula_specific_data.get("ELP_mm", 5.0)
+    
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Haigis ELP=%smm K1=%s K2=%s deltaK=%s", elp_mm, k1, k2, delta_k)
+    
+    # Calculate advanced toric IOL recommendation
+    return _toric_calculator.calculate_toric_iol(
+        k1=k1, k2=k2, k1_axis=k1_axis, k2_axis=k2_axis,
+        sia_magnitude=sia_magnitude, sia_axis=sia_axis,
+        elp_mm=elp_mm, target_refraction=0.0,
+        policy_key=policy_key
+    )
+
+
+class _TokenBucket:
+    """Allow up to `burst` events, refilled at `burst` per `period` seconds."""
+
+    def __init__(self, burst: int, period: float):
+        self.burst = burst
+        self.rate = burst / period
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+# Cap full tracebacks from /suggest fallbacks so a persistent failure can't flood the logs
+_suggest_traceback_bucket = _TokenBucket(burst=5, period=60.0)
+
+# Bytecode cache lets each worker skip re-compiling templates after the first
+# boot; review.html is loaded once here so the first GET /review doesn't parse it.
+templates = Jinja2Templates(env=jinja2.Environment(
+    loader=jinja2.FileSystemLoader("templates"),
+    autoescape=True,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(),
+))
+templates.get_template("review.html")
 
 # Serve static assets (CSS/JS) from app/static at /static
 app = FastAPI(title="Lakecalc-AI IOL Agent")
@@ -47,13 +115,17 @@ app.add_middleware(
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id = request.headers.get("X-Request-ID")
+        if request_id is None:
+            request_id = uuid.uuid4().hex
         request.state.request_id = request_id
         response = await call_next(request)
         response.headers["X-Request-ID"] = request_id
         return response
 
 app.add_middleware(RequestIdMiddleware)
+# /extract JSON and /debug/ocr_text compress well; level 1 keeps the CPU cost low
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
 
 # Include routers
 from .routes.suggest import router as suggest_router
@@ -76,23 +148,27 @@ def health_check():
     """Health check endpoint for Railway deployment."""
     return {"status": "healthy", "service": "lakecalc-ai", "version": "1.0.0"}
 
+_ALLOWED_TYPES = frozenset({"application/pdf", "image/png", "image/jpeg"})
+
 @app.post("/upload", response_model=UploadResponse)
-async def upload(file: UploadFile = File(...)):
-    if file.content_type not in {"application/pdf", "image/png", "image/jpeg"}:
+async def upload(background: BackgroundTasks, file: UploadFile = File(...)):
+    if file.content_type not in _ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Only pdf|png|jpg|jpeg accepted")
     # size cap
     body = await file.read()
-    mb = len(body) / (1024 * 1024)
-    if mb > settings.max_upload_mb:
-        raise HTTPException(status_code=413, detail=f"File too large: {mb:.1f} MB")
+    size = len(body)
+    # read per request so runtime/test overrides of settings.max_upload_mb apply
+    if size > settings.max_upload_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"File too large: {size / (1024 * 1024):.1f} MB")
 
-    fid = str(uuid.uuid4())
+    fid = uuid.uuid4().hex
     ext = Path(file.filename).suffix.lower() or ".bin"
     dest = UPLOADS / f"{fid}{ext}"
     with open(dest, "wb") as f:
         f.write(body)
 
-    write_audit("upload", {"file_id": fid, "filename": file.filename, "content_type": file.content_type, "size_mb": mb})
+    # audit is written after the response is sent so the disk write stays off the request path
+    background.add_task(write_audit, "upload", {"file_id": fid, "filename": file.filename, "content_type": file.content_type, "size_mb": size / (1024 * 1024)})
     return UploadResponse(file_id=fid, filename=file.filename)
 
 
@@ -100,20 +176,21 @@ async def upload(file: UploadFile = File(...)):
 # OLD /extract endpoint removed - now handled by app/routes/extract.py
 # This uses the new universal biometry parser with RunPod Ollama
 
+# edit keys (e.g. "od.axial_length") whose values are range-checked on review
+_RANGE_KEYS = frozenset({"axial_length", "acd", "lt", "cct", "wtw"})
+
 @app.post("/review")
-async def review(payload: ReviewPayload):
+async def review(payload: ReviewPayload, background: BackgroundTasks):
     # Validate numeric ranges on edited values if keys match known fields
-    from .utils import to_float, check_range
-
     flags = []
     for key, value in payload.edits.items():
-        base_key = key.split(".")[-1]
-        if base_key in {"axial_length", "acd", "lt", "cct", "wtw"}:
+        base_key = key.rpartition(".")[2]
+        if base_key in _RANGE_KEYS:
             ok, msg = check_range(base_key, to_float(str(value)))
             if not ok and msg:
                 flags.append(f"{key}: {msg}")
 
-    write_audit("review", {"file_id": payload.file_id, "edits": payload.edits, "flags": flags})
+    background.add_task(write_audit, "review", {"file_id": payload.file_id, "edits": payload.edits, "flags": flags})
     return {"ok": True, "file_id": payload.file_id, "flags": flags}
 
 @app.get("/review", response_class=HTMLResponse)
@@ -124,51 +201,12 @@ async def review_form(request: Request, file_id: str):
 async def suggest(q: SuggestQuery):
     """Advanced suggest endpoint using the new Advanced Toric Calculator."""
     try:
-        from app.services.toric_calculator import ToricCalculator
-        
-        # Initialize Advanced Toric Calculator
-        calculator = ToricCalculator()
-        
-        # For the legacy endpoint, we need to estimate some parameters
-        # Use reasonable defaults for suggestion purposes
-        k1 = 43.0  # Default K1
-        k2 = k1 + q.deltaK  # Estimate K2 from deltaK
-        k1_axis = 90  # Default steep axis
-        k2_axis = 180  # Default flat axis
-        
         # Use provided SIA values or eye-specific defaults
         # Note: For the legacy endpoint, we don't know which eye, so use OD default
         sia_magnitude = q.sia_magnitude or q.sia or 0.1  # Default to OD value (0.1D)
         sia_axis = q.sia_axis or 120.0  # Use provided axis or default
-        
-        # Calculate Haigis ELP for accurate toricity ratio
-        from app.services.calculations import IOLCalculator, IOLCalculationInput
-        
-        # Create minimal biometry for Haigis ELP calculation
-        calc_input = IOLCalculationInput(
-            axial_length=23.77,  # Default AL for suggestion
-            k_avg=(k1 + k2) / 2,  # Average K
-            acd=2.83,  # Default ACD
-            target_refraction=0.0,
-            k1=k1,  # Explicit K1
-            k2=k2,  # Explicit K2
-            lt=None,  # Not required for Haigis
-            wtw=None,  # Not required for Haigis
-            cct=None  # Not required for Haigis
-        )
-        
-        iol_calculator = IOLCalculator()
-        haigis_result = iol_calculator._calculate_haigis(calc_input, {})
-        elp_mm = haigis_result.formula_specific_data.get("ELP_mm", 5.0)
-        
-        log.info(f"Calculated Haigis ELP: {elp_mm}mm for K1={k1}, K2={k2}, deltaK={q.deltaK}")
-        
-        # Calculate advanced toric IOL recommendation
-        toric_result = calculator.calculate_toric_iol(
-            k1=k1, k2=k2, k1_axis=k1_axis, k2_axis=k2_axis,
-            sia_magnitude=sia_magnitude, sia_axis=sia_axis,
-            elp_mm=elp_mm, target_refraction=0.0,
-            policy_key=q.toric_policy or "lifetime_atr"
+        toric_result = _legacy_toric_result(
+            q.deltaK, sia_magnitude, sia_axis, q.toric_policy or "lifetime_atr"
         )
         
         # Use new IOL database
@@ -189,10 +227,11 @@ async def suggest(q: SuggestQuery):
             rationale=rationale,
             families=fams,
         )
-    except Exception as e:
-        log.error(f"Error in advanced suggest endpoint: {e}")
-        import traceback
-        log.error(f"Full traceback: {traceback.format_exc()}")
+    except (ValueError, KeyError, TypeError, ArithmeticError) as e:
+        if _suggest_traceback_bucket.take():
+            log.exception("Advanced suggest failed; using basic toric decision")
+        else:
+            log.warning("Advanced suggest failed (%s: %s); using basic toric decision", type(e).__name__, e)
         # Fallback to basic calculation
         recommend, effective, th = toric_decision(q.deltaK, q.sia)
         fams = [
@@ -208,26 +247,12 @@ async def suggest(q: SuggestQuery):
             families=fams,
         )
 
-@app.get("/suggest/families")
-async def get_families():
-    """Get all available IOL families from the comprehensive database."""
-    try:
-        db = get_iol_database()
-        families = db.get_all_families()
-        return families
-    except Exception as e:
-        log.error(f"Error loading IOL families: {e}")
-        # Fallback to legacy format for backward compatibility
-        return [
-            {"brand": "Alcon", "family": "AcrySof IQ", "variants": [{"name": "SN60WF", "type": "monofocal"}, {"name": "TORIC SN6ATx", "type": "toric"}]},
-            {"brand": "J&J", "family": "Tecnis", "variants": [{"name": "ZCB00", "type": "monofocal"}, {"name": "ZCTx", "type": "toric"}]}
-        ]
+# GET /suggest/families is served by routes/suggest.py (registered above)
 
 @app.get("/suggest/policies")
 async def get_toric_policies():
     """Get available toric IOL policies."""
     try:
-        from app.services.toric_policy import get_available_policies
         return {"policies": get_available_policies()}
     except Exception as e:
         log.error(f"Error getting toric policies: {e}")
@@ -235,8 +260,19 @@ async def get_toric_policies():
 
 # Debug endpoint to fetch raw OCR text by file hash
 @app.get("/debug/ocr_text/{file_hash}", response_class=PlainTextResponse)
-async def get_ocr_text(file_hash: str):
+async def get_ocr_text(file_hash: str, request: Request):
+    gz_path = TEXT_DIR / f"{file_hash}.txt.gz"
+    if gz_path.is_file():
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            # the cache entry is already gzip; stream it as-is (GZipMiddleware leaves it alone)
+            return FileResponse(
+                gz_path,
+                media_type="text/plain; charset=utf-8",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        return PlainTextResponse(gzip.decompress(gz_path.read_bytes()).decode("utf-8"))
     fpath = TEXT_DIR / f"{file_hash}.txt"
-    if not fpath.exists():
+    if not fpath.is_file():
         return PlainTextResponse("Not found", status_code=404)
-    return fpath.read_text(encoding="utf-8")
+    # stream from disk rather than loading the whole OCR text into memory
+    return FileResponse(fpath, media_type="text/plain; charset=utf-8")
@@ -1,9 +1,12 @@
-import io, json, logging, hashlib, os
+import gzip, json, logging, os, tempfile, threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import fitz  # PyMuPDF
 from .config import settings
 from .storage import TEXT_DIR
 from .storage import gcs_upload_bytes, gcs_download_bytes
+from .utils import hash_file
 
 log = logging.getLogger(__name__)
 
@@ -14,11 +17,31 @@ log.info("Google Vision SDK disabled - using PyTesseract for OCR")
 
 MAX_OCR_PAGES = int(os.getenv("MAX_OCR_PAGES", "4"))  # Process first 4 pages for dual-eye reports
 OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+OCR_JPEG_QUALITY = int(os.getenv("OCR_JPEG_QUALITY", "85"))
 
 def _file_hash(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    # streamed, so multi-MB PDFs are never held in memory just to be hashed
+    return hash_file(path)
+
+# (path, size, mtime_ns) -> sha256, so re-OCRing an unchanged upload skips re-hashing it
+_STAT_CACHE: dict[tuple[str, int, int], str] = {}
+_STAT_CACHE_MAX = 1024
+
+def _cached_file_hash(path: Path) -> str:
+    st = path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    fhash = _STAT_CACHE.get(key)
+    if fhash is None:
+        fhash = _file_hash(path)
+        if len(_STAT_CACHE) >= _STAT_CACHE_MAX:
+            _STAT_CACHE.pop(next(iter(_STAT_CACHE)))
+        _STAT_CACHE[key] = fhash
+    return fhash
 
 def _render_pdf_pages(path: Path, max_pages: int = 1, dpi: int = 200) -> list[bytes]:
+    """Render the first pages as grayscale JPEG bytes (Vision sniffs the format;
+    JPEG keeps scanned pages 2-3x smaller than PNG on the wire, and OCR needs no
+    colour, which also cuts the pixel buffer to one channel)."""
     images: list[bytes] = []
     zoom = dpi / 72.0
     mat = fitz.Matrix(zoom, zoom)
@@ -26,29 +49,54 @@ def _render_pdf_pages(path: Path, max_pages: int = 1, dpi: int = 200) -> list[by
         for i, page in enumerate(doc):
             if i >= max_pages:
                 break
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            images.append(pix.tobytes("png"))
+            pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+            images.append(pix.tobytes("jpeg", jpg_quality=OCR_JPEG_QUALITY))
     return images
 
-def _make_creds():
-    if settings.google_creds:
-        return service_account.Credentials.from_service_account_file(settings.google_creds)
-    elif settings.google_creds_json:
-        return service_account.Credentials.from_service_account_info(json.loads(settings.google_creds_json))
-    else:
+@lru_cache(maxsize=1)
+def _load_creds(creds_path: str | None, creds_json: str | None):
+    # keyed on the settings values, so the key file / JSON is parsed once per config
+    if not (creds_path or creds_json):
         return None
+    # imported here so workers that never OCR don't pay for google-auth
+    from google.oauth2 import service_account
+    if creds_path:
+        return service_account.Credentials.from_service_account_file(creds_path)
+    elif creds_json:
+        return service_account.Credentials.from_service_account_info(json.loads(creds_json))
+
+def _make_creds():
+    return _load_creds(settings.google_creds, settings.google_creds_json)
+
+# One ImageAnnotatorClient per process: building it re-reads the credentials
+# and opens a new gRPC channel, and the client is safe to share across threads.
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+def _get_client():
+    """Return the shared Vision client, or None when no credentials are configured.
+    Invalid credentials raise and are not cached, so a fixed config is retried.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                creds = _make_creds()
+                if not creds:
+                    return None
+                _CLIENT = vision.ImageAnnotatorClient(credentials=creds)
+    return _CLIENT
 
 def google_vision_image_bytes(img_bytes: bytes) -> tuple[str, str | None]:
     if vision is None:
         return "", "Google Vision SDK not available"
     try:
-        creds = _make_creds()
-        if not creds:
+        client = _get_client()
+        if client is None:
             return "", "GOOGLE_APPLICATION_CREDENTIALS not set"
     except Exception as e:
         return "", f"Invalid Google credentials: {e}"
 
-    client = vision.ImageAnnotatorClient(credentials=creds)
     image = vision.Image(content=img_bytes)
     resp = client.document_text_detection(image=image)
     if resp.error.message:
@@ -60,6 +108,7 @@ def google_vision_image_bytes(img_bytes: bytes) -> tuple[str, str | None]:
 def _full_text_annotation_to_dict(fta) -> dict:
     """Convert Vision full_text_annotation to a compact JSON-serializable dict.
     We include pages -> blocks -> paragraphs -> words with bounding boxes and text.
+    Bounding boxes are flat [x1, y1, x2, y2, ...] lists (layout cache version "2").
     """
     out = {"pages": []}
     try:
@@ -69,9 +118,7 @@ def _full_text_annotation_to_dict(fta) -> dict:
                 block = {"bbox": [], "paragraphs": []}
                 # block bounding box
                 try:
-                    block["bbox"] = [
-                        {"x": v.x, "y": v.y} for v in getattr(b.bounding_box, "vertices", [])
-                    ]
+                    block["bbox"] = [c for v in getattr(b.bounding_box, "vertices", []) for c in (v.x, v.y)]
                 except Exception:
                     block["bbox"] = []
                 for par in getattr(b, "paragraphs", []):
@@ -83,9 +130,7 @@ def _full_text_annotation_to_dict(fta) -> dict:
                         except Exception:
                             wt = getattr(w, "text", "") if hasattr(w, "text") else ""
                         try:
-                            bbox = [
-                                {"x": v.x, "y": v.y} for v in getattr(w.bounding_box, "vertices", [])
-                            ]
+                            bbox = [c for v in getattr(w.bounding_box, "vertices", []) for c in (v.x, v.y)]
                         except Exception:
                             bbox = []
                         paragraph["words"].append({"text": wt, "bbox": bbox})
@@ -103,32 +148,76 @@ def google_vision_image_bytes_with_layout(img_bytes: bytes) -> tuple[str, dict |
     if vision is None:
         return "", None, "Google Vision SDK not available"
     try:
-        creds = _make_creds()
-        if not creds:
+        client = _get_client()
+        if client is None:
             return "", None, "GOOGLE_APPLICATION_CREDENTIALS not set"
     except Exception as e:
         return "", None, f"Invalid Google credentials: {e}"
 
-    client = vision.ImageAnnotatorClient(credentials=creds)
     image = vision.Image(content=img_bytes)
     resp = client.document_text_detection(image=image)
     if resp.error.message:
         return "", None, f"Vision error: {resp.error.message}"
-    layout = _full_text_annotation_to_dict(resp.full_text_annotation)
-    return resp.full_text_annotation.text or "", layout, None
+    # proto-plus wraps the message anew on every attribute access; bind it once
+    fta = resp.full_text_annotation
+    return fta.text or "", _full_text_annotation_to_dict(fta), None
+
+# batch_annotate_images accepts at most 16 images per request
+_VISION_BATCH_LIMIT = 16
+
+def google_vision_batch_image_bytes_with_layout(images: list[bytes]) -> list[tuple[str, dict | None, str | None]]:
+    """Return one (text, layout_dict, err) per image, using a single
+    batch_annotate_images round trip per 16 images instead of one RPC each.
+    Dormant while the Vision SDK is disabled (vision is None).
+    """
+    if vision is None:
+        return [("", None, "Google Vision SDK not available")] * len(images)
+    try:
+        client = _get_client()
+        if client is None:
+            return [("", None, "GOOGLE_APPLICATION_CREDENTIALS not set")] * len(images)
+    except Exception as e:
+        return [("", None, f"Invalid Google credentials: {e}")] * len(images)
+
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    results: list[tuple[str, dict | None, str | None]] = []
+    for start in range(0, len(images), _VISION_BATCH_LIMIT):
+        requests = [
+            vision.AnnotateImageRequest(image=vision.Image(content=b), features=[feature])
+            for b in images[start:start + _VISION_BATCH_LIMIT]
+        ]
+        batch = client.batch_annotate_images(requests=requests)
+        for resp in batch.responses:
+            if resp.error.message:
+                results.append(("", None, f"Vision error: {resp.error.message}"))
+                continue
+            fta = resp.full_text_annotation
+            results.append((fta.text or "", _full_text_annotation_to_dict(fta), None))
+    return results
+
+def _ocr_pages_with_layout(pages: list[bytes]) -> list[tuple[str, dict | None, str | None]]:
+    """OCR rendered pages with one batched request; if the batch endpoint
+    fails, fall back to per-page requests issued concurrently (gRPC releases
+    the GIL while waiting on the network, and the client is shared).
+    """
+    try:
+        return google_vision_batch_image_bytes_with_layout(pages)
+    except Exception:
+        log.warning("Vision batch request failed; retrying %d pages individually", len(pages), exc_info=True)
+    with ThreadPoolExecutor(max_workers=min(len(pages), 4)) as ex:
+        return list(ex.map(google_vision_image_bytes_with_layout, pages))
 
 def google_vision_ocr(file_path: Path) -> tuple[str, str | None]:
     if vision is None:
         return "", "Google Vision SDK not available"
     try:
-        creds = _make_creds()
-        if not creds:
+        client = _get_client()
+        if client is None:
             return "", "GOOGLE_APPLICATION_CREDENTIALS not set"
     except Exception as e:
         return "", f"Invalid Google credentials: {e}"
 
     # backward-compatible simple call
-    client = vision.ImageAnnotatorClient(credentials=creds)
     content = file_path.read_bytes()
     image = vision.Image(content=content)
     response = client.document_text_detection(image=image)
@@ -145,26 +234,40 @@ def google_vision_ocr_with_layout(file_path: Path) -> tuple[str, dict | None, st
     if vision is None:
         return "", None, "Google Vision SDK not available"
     try:
-        creds = _make_creds()
-        if not creds:
+        client = _get_client()
+        if client is None:
             return "", None, "GOOGLE_APPLICATION_CREDENTIALS not set"
     except Exception as e:
         return "", None, f"Invalid Google credentials: {e}"
 
-    client = vision.ImageAnnotatorClient(credentials=creds)
     content = file_path.read_bytes()
     image = vision.Image(content=content)
     response = client.document_text_detection(image=image)
     if response.error.message:
         return "", None, f"Vision error: {response.error.message}"
-    text = response.full_text_annotation.text or ""
-    layout = _full_text_annotation_to_dict(response.full_text_annotation)
+    fta = response.full_text_annotation
+    text = fta.text or ""
+    layout = _full_text_annotation_to_dict(fta)
     return text, layout, None
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + os.replace so a crash never leaves a truncated cache entry."""
+    # unique temp name per writer: concurrent OCRs of the same upload must not share one
+    fh = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False)
+    tmp = Path(fh.name)
+    try:
+        with fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 def ocr_file(file_path: Path) -> tuple[str, str | None]:
     # Cache by SHA256 of file bytes
-    fhash = _file_hash(file_path)
-    cached = TEXT_DIR / f"{fhash}.txt"
+    fhash = _cached_file_hash(file_path)
+    cached = TEXT_DIR / f"{fhash}.txt.gz"
+    legacy_cached = TEXT_DIR / f"{fhash}.txt"
     layout_cached = TEXT_DIR / f"{fhash}.json"
     # Try to load cached text/layout from GCS if configured
     try:
@@ -190,7 +293,10 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
 
     if cached.exists():
         # read existing cache; if a layout JSON exists, leave it as-is
-        return cached.read_text(encoding="utf-8"), None
+        return gzip.decompress(cached.read_bytes()).decode("utf-8"), None
+    if legacy_cached.exists():
+        # uncompressed entries written before the cache was gzipped
+        return legacy_cached.read_text(encoding="utf-8"), None
 
     ext = file_path.suffix.lower()
     text = ""
@@ -203,7 +309,7 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
             try:
                 # write a versioned layout cache to allow future format changes
                 cache_obj = {
-                    "version": "1",
+                    "version": "2",
                     "source": "google-vision",
                     "text_hash": fhash,
                     "pages": layout.get("pages", []),
@@ -214,11 +320,11 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
                     bucket = os.getenv("GCS_BUCKET_NAME") or os.getenv("GCS_BUCKET")
                     if bucket:
                         blob_name = f"ocr_layouts/{fhash}.json"
-                        written = gcs_upload_bytes(bucket, blob_name, json.dumps(cache_obj).encode("utf-8"))
+                        written = gcs_upload_bytes(bucket, blob_name, json.dumps(cache_obj, separators=(",", ":")).encode("utf-8"))
                 except Exception:
                     written = False
                 if not written:
-                    layout_cached.write_text(json.dumps(cache_obj), encoding="utf-8")
+                    _write_atomic(layout_cached, json.dumps(cache_obj, separators=(",", ":")).encode("utf-8"))
             except Exception:
                 log.exception("Failed writing layout cache for %s", file_path.name)
 
@@ -228,10 +334,9 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
         if not pages:
             return "", "PDF render failed (no pages)"
         parts: list[str] = []
-        # For PDFs we run OCR on each rendered page and also attempt to collect layout
+        # For PDFs we OCR all rendered pages in one batched request and also collect layout
         combined_layout = {"pages": []}
-        for png in pages:
-            t, layout, e = google_vision_image_bytes_with_layout(png)
+        for t, layout, e in _ocr_pages_with_layout(pages):
             if e:
                 err = e
             parts.append(t)
@@ -241,7 +346,7 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
         if combined_layout.get("pages"):
             try:
                 cache_obj = {
-                    "version": "1",
+                    "version": "2",
                     "source": "google-vision",
                     "text_hash": fhash,
                     "pages": combined_layout.get("pages", []),
@@ -251,11 +356,11 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
                     bucket = settings.google_creds_json and (os.getenv("GCS_BUCKET_NAME") or os.getenv("GCS_BUCKET"))
                     if bucket:
                         blob_name = f"ocr_layouts/{fhash}.json"
-                        written = gcs_upload_bytes(bucket, blob_name, json.dumps(cache_obj).encode("utf-8"))
+                        written = gcs_upload_bytes(bucket, blob_name, json.dumps(cache_obj, separators=(",", ":")).encode("utf-8"))
                 except Exception:
                     written = False
                 if not written:
-                    layout_cached.write_text(json.dumps(cache_obj), encoding="utf-8")
+                    _write_atomic(layout_cached, json.dumps(cache_obj, separators=(",", ":")).encode("utf-8"))
             except Exception:
                 log.exception("Failed writing layout cache for pdf %s", file_path.name)
         text = "\n".join(parts).strip()
@@ -267,5 +372,6 @@ def ocr_file(file_path: Path) -> tuple[str, str | None]:
         log.error("OCR failed for %s: %s", file_path.name, err)
         return "", err or "OCR failed"
 
-    cached.write_text(text, encoding="utf-8")
+    # OCR text compresses ~5x; level 3 is plenty for plain text
+    _write_atomic(cached, gzip.compress(text.encode("utf-8"), compresslevel=3))
     return text, None
@@ -1,14 +1,36 @@
-import re, logging, json, os
-from typing import Dict, Tuple, List
+import re, logging, json, os, sys
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Tuple, List, Optional
 from pathlib import Path
 from .utils import to_float, check_range, hash_text, llm_extract_missing_fields
 from .config import settings
 from .models.api import ExtractResult, EyeData
 
+# Optional: google-re2 runs the fused field scan in linear time (DFA), ~1.1-2x faster
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Optional: orjson decodes the layout cache ~3x faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 log = logging.getLogger(__name__)
 
 # Common helpers
-NUM = r"(?P<val>-?\d{1,3}[\.,]?\d{0,3})"
+# The number is atomic (3.11+): every unit suffix starts with \s* and a non-digit,
+# so giving digits back can never complete a match and only costs time on long
+# digit runs in noisy OCR.
+if sys.version_info >= (3, 11):
+    NUM = r"(?P<val>(?>-?\d{1,3}[\.,]?\d{0,3}))"
+else:
+    NUM = r"(?P<val>-?\d{1,3}[\.,]?\d{0,3})"
 MM = r"(?:\s*mm)"
 UM = r"(?:\s*(?:µm|um))"
 DIOP = r"(?:\s*D)"
@@ -19,7 +41,7 @@ def sanitize_axis(raw_candidate: str) -> str | None:
     """Sanitize a raw numeric axis candidate: take rightmost 1-3 digits and validate 0-180."""
     if not raw_candidate:
         return None
-    groups = re.findall(r"(\d{1,3})", raw_candidate)
+    groups = _AXIS_DIGITS_RX.findall(raw_candidate)
     if not groups:
         return None
     candidate = groups[-1]
@@ -66,36 +88,242 @@ PATTERNS = {
 DEVICE_ORDER = ["IOLMaster700", "Pentacam", "Generic"]
 
 
-def _grab(rx: re.Pattern, text: str) -> tuple[str, float | None]:
-    m = rx.search(text)
-    if not m:
-        return "", None
-    raw = m.group("val")
-    return raw, to_float(raw)
+# re2's \s and \d are ASCII-only; spell out the Unicode classes Python's str patterns
+# use, since PDF text layers often carry NBSP and other Unicode spaces
+_RE2_UNICODE_CLASSES = (
+    (r"\s", r"[\t-\r\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]"),
+    (r"\d", r"\p{Nd}"),
+)
+
+
+def _fuse_patterns(patterns: Dict[str, re.Pattern]):
+    """Join a device's field patterns into one alternation so a segment is scanned once.
+    Each field becomes group `key` with its value group renamed to `key_val`.
+    Compiled with re2 when installed (same finditer/lastgroup API), else stdlib re.
+    """
+    parts = [
+        f"(?P<{key}>{rx.pattern.replace('(?P<val>', f'(?P<{key}_val>')})"
+        for key, rx in patterns.items()
+    ]
+    source = "|".join(parts)
+    if RE2_AVAILABLE:
+        try:
+            # re2 has no atomic groups and never backtracks, so plain groups are equivalent
+            re2_source = source.replace("(?>", "(?:")
+            for py_class, re2_class in _RE2_UNICODE_CLASSES:
+                re2_source = re2_source.replace(py_class, re2_class)
+            return re2.compile("(?i)" + re2_source)
+        except Exception:
+            log.warning("re2 could not compile fused field pattern; using re")
+    return re.compile(source, re.I)
+
+
+PATTERNS_COMBINED = {dev: _fuse_patterns(p) for dev, p in PATTERNS.items()}
+
+
+def _scan_fields(combined, field_count: int, eye_text: str) -> Dict[str, Tuple[str, float | None]]:
+    """First hit per field of a fused device pattern, same as searching each field pattern.
+    The scan resumes one character after each match start rather than after its end: a match
+    can contain the start of another field's (the Generic AK match 'AK23D' holds K2 '3'), and
+    no two field patterns match at the same position.
+    """
+    scalars: Dict[str, Tuple[str, float | None]] = {}
+    pos = 0
+    while len(scalars) < field_count:
+        m = combined.search(eye_text, pos)
+        if m is None:
+            break
+        pos = m.start() + 1
+        key = m.lastgroup
+        if key in scalars:
+            continue
+        raw = m.group(f"{key}_val")
+        if raw:
+            scalars[key] = (raw, _to_float_cached(raw))
+    return scalars
+
+
+# Patterns used inside parse_text, compiled once at import rather than looked
+# up in re's cache on every call
+_NORM_AT_RX = re.compile(r"\s*@\s*")
+_NORM_DEG_RX = re.compile(r"(\d)°")
+_NORM_K_TOKEN_RX = re.compile(r"\b(K1:|K2:|AK:|K1|K2|AK)\s*")
+_NORM_DEG_GARBAGE_RX = re.compile(r"(\d{3,})(\d{1,3})\s*°")
+_NORM_AXIS_LINE_RX = re.compile(r"\n\s*(@\s*\d{1,3}\s*°)\s*\n")
+_NORM_SPACES_RX = re.compile(r"[ \t]+")
+_OD_RX = re.compile(r"(?m)^\s*OD\b[:\-]?[\s\S]{0,800}?Valores biométricos[\s\S]{0,400}", re.I)
+_OS_RX = re.compile(r"(?m)^\s*OS\b[:\-]?[\s\S]{0,800}?Valores biométricos[\s\S]{0,400}", re.I)
+_SEGMENT_ANCHOR_RX = re.compile(r"Valores biométricos|AL:", re.I)
+_VALORES_RX = re.compile(r"Valores biométricos", re.I)
+_OS_FALLBACK_RX = re.compile(r"OS[\s\S]{0,2000}?(Valores biométricos|AL:)\s*[:\-]?[\s\S]{0,400}", re.I)
+_PAGE_SPLIT_RX = re.compile(r"\nPágina\s+\d+\s+de\s+\d+")
+_OD_TOKEN_RX = re.compile(r"\bOD\b", re.I)
+_K_LINE_RX = re.compile(r"\b(K1|K2)\b\s*[:\-]?\s*(\d{1,3}[\.,]\d{1,3})\s*D", re.I)
+# first K1 and first K2 reading in one pass; a match never contains another 'K', so
+# alternation finds the same positions as two separate searches
+_K_ANCHOR_RX = re.compile(
+    "|".join(rf"(?P<{label}>\b{label}\b\s*[:\-]?\s*\d{{1,3}}[\.,]\d{{1,3}}\s*D)" for label in ("K1", "K2")),
+    re.I,
+)
+_AXIS_DIGITS_RX = re.compile(r"(\d{1,3})")
+_AXIS_AT_RX = re.compile(r"@\s*(\d{1,3})\s*°")
+_AXIS_OPT_AT_RX = re.compile(r"@?\s*(\d{1,3})\s*°")
+_AXIS_DEG_RX = re.compile(r"(\d{1,3})\s*°")
+# Labels that end an axis lookahead: CW-Chord, AL, WTW, CCT, ACD, LT, SE, SD, TK, TSE,
+# ATK, P, Ix, ly, Fixação, Comentário, mm, μm, D, VA, Status de olho, Resultado,
+# Paciente, Médico, Operador, Data, Versão, Página. There are no word boundaries and the
+# list includes bare P and D, so every label containing p/d or another entry
+# (TSE -> se, ATK -> tk, Fixação -> ix) is folded away; the match set is identical.
+_STOP_LABELS_RX = re.compile(r"[pd]|al|wtw|cct|lt|se|tk|ix|ly|mm|μm|va|versão|comentário", re.I)
+_NUMERIC_NOISE_RX = re.compile(r"\s*\d{1,4}\s*")
+_TAIL_SKIP_RX = re.compile(r"\b(TSE|TK1|TK2|TK|ATK|AK|CW[- ]?Chord|Chord|mm|μm|SD)\b", re.I)
+_FALLBACK_SKIP_RX = re.compile(r"\bmm\b|CW[- ]?Chord|Chord\b|\bTSE\b|\bSD\b|TK\d*", re.I)
+_DIGIT_RX = re.compile(r"\d")
+_NEWLINE_RX = re.compile(r"\n")
+_LAYOUT_K_RX = {label: re.compile(label, re.I) for label in ("K1", "K2")}
+_LAYOUT_AXIS_MARK_RX = re.compile(r"@|°")
+_LAYOUT_NUM_RX = re.compile(r"\d{1,3}")
+_LAYOUT_CHORD_RX = re.compile(r"\b(CW[- ]?Chord|Chord|mm)\b", re.I)
+
+
+# Per-eye output fields, and their "eye.field" confidence keys built once
+_SCALAR_FIELDS = ("axial_length", "acd", "lt", "cct", "wtw")
+_K_FIELDS = ("k1", "k2", "ak", "k1_axis", "k2_axis")
+_CONF_KEYS = {
+    eye: {key: f"{eye}.{key}" for key in (*_SCALAR_FIELDS, "k1", "k2", "k1_axis", "k2_axis", "ak", "axis")}
+    for eye in ("od", "os")
+}
+_ABSENT_OS_CONFIDENCE = dict.fromkeys(_CONF_KEYS["os"].values(), 0.0)
+_NO_MATCH = ("", None)
+# EyeData fields the LLM fallback may fill
+_LLM_MERGE_KEYS = frozenset(_SCALAR_FIELDS + _K_FIELDS)
+
+# Captured values are short and repeat a lot ("0,00", "43,25" in both eyes, reruns)
+_to_float_cached = lru_cache(maxsize=4096)(to_float)
+
+# sanitize_axis for every 1-3 digit ASCII token the '@ N°' patterns can capture
+# ('7', '07', '007', ...); other tokens (e.g. non-ASCII digits) miss and go through
+# sanitize_axis itself
+_AXIS_LUT = {
+    tok: sanitize_axis(tok)
+    for width in (1, 2, 3)
+    for tok in (f"{i:0{width}d}" for i in range(10 ** width))
+}
+
+
+_IOLMASTER700_RX = re.compile(r"IOL\s*Master\s*700", re.I)
 
 
 def detect_device(text: str) -> str:
-    if re.search(r"IOL\s*Master\s*700", text, re.I):
+    # substring probes first; the regex only runs when both literals are present
+    t = text.lower()
+    if "master" in t and "700" in t and _IOLMASTER700_RX.search(text):
         return "IOLMaster700"
-    if re.search(r"Pentacam", text, re.I):
+    if "pentacam" in t:
         return "Pentacam"
     return "Generic"
 
 
+def _perpendicular_axis(axis: str) -> str | None:
+    """Axis 90 degrees from `axis` on the 0-179 scale; None if `axis` isn't an integer."""
+    try:
+        return str((int(axis) + 90) % 180)
+    except (ValueError, TypeError):
+        return None
+
+
+def _nearest_axis(occurrences: List[Tuple[int, str]], pos: int) -> str | None:
+    """Axis of the occurrence closest to `pos`, the earlier one on a tie.
+    `occurrences` are (position, axis) pairs in text order."""
+    i = bisect_left(occurrences, (pos,))
+    if i == len(occurrences):
+        return occurrences[-1][1] if occurrences else None
+    if i == 0:
+        return occurrences[0][1]
+    (before, before_axis), (after, after_axis) = occurrences[i - 1], occurrences[i]
+    return before_axis if pos - before <= after - pos else after_axis
+
+
+def normalize_for_device(dev_name: str, raw_text: str) -> str:
+    """Repair device-specific OCR artifacts (glued tokens, stray degree digits) before parsing."""
+    t = raw_text
+    if dev_name == "IOLMaster700":
+        # common issues in device export: tokens glued like '43,80 D88875°' or 'K1: 41,45 D @K2:'
+        # 1) ensure degree symbol separated: '75°' or '@ 75°' -> keep degree but add space before '@' and '°'
+        # (this also leaves every 'D@' / 'D  @' as 'D @', so no separate pass is needed)
+        t = _NORM_AT_RX.sub(" @ ", t)
+        t = _NORM_DEG_RX.sub(r"\1 °", t)
+        # 2) ensure K1/K2/AK tokens have a separating space if collapsed (do NOT force newlines)
+        t = _NORM_K_TOKEN_RX.sub(lambda m: m.group(1) + " ", t)
+        # 3) remove repeated digit garbage before degrees (e.g., '88875 °' -> '75 °')
+        t = _NORM_DEG_GARBAGE_RX.sub(lambda m: m.group(2) + " °", t)
+        # 3b) if an axis appears alone on its own line (e.g., '\n@ 100°\n'), merge it onto the previous line
+        t = _NORM_AXIS_LINE_RX.sub(lambda m: " " + m.group(1) + "\n", t)
+        # 4) collapse multiple spaces to single
+        t = _NORM_SPACES_RX.sub(" ", t)
+    return t
+
+
+def _load_json(data: bytes):
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN, which json.dumps writes but orjson rejects
+    return json.loads(data)
+
+
+def _layout_stamp(text: str) -> tuple[str, int, int] | None:
+    """Identify the layout cache file _parse_text would read for this text, so a
+    layout written (or rewritten) after a parse invalidates the memoized result."""
+    path = Path(settings.uploads_dir) / "ocr" / f"{hash_text(text)}.json"
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=256)
+def _parse_text_cached(text: str, use_layout: bool, strict_text: bool, layout_stamp) -> ExtractResult:
+    return _parse_text("", text, None, use_layout, strict_text)
+
+
 def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
     # Optionally use layout-aware pairing if a layout cache exists and flag enabled
     use_layout = os.getenv("USE_LAYOUT_PAIRING", "false").lower() in ("1", "true", "yes")
     strict_text = settings.strict_text_extraction
+    if llm_func is not None:
+        # injected LLM callables (tests) may be stateful; never memoize around them
+        return _parse_text(file_id, text, llm_func, use_layout, strict_text)
+    # Re-extracting the same document yields byte-identical OCR text, so reuse the
+    # parse; hand out fresh containers since callers mutate the result. Field
+    # values are immutable strings, so copying the mutable parts is enough and
+    # ~4x cheaper than a deepcopy.
+    stamp = _layout_stamp(text) if use_layout else None
+    cached = _parse_text_cached(text, use_layout, strict_text, stamp)
+    return cached.model_copy(update={
+        "file_id": file_id,
+        "od": cached.od.model_copy(),
+        "os": cached.os.model_copy(),
+        "confidence": dict(cached.confidence),
+        "flags": list(cached.flags),
+    })
+
+
+def _parse_text(file_id: str, text: str, llm_func, use_layout: bool, strict_text: bool) -> ExtractResult:
     layout_data = None
+    fhash = None
     if use_layout:
         try:
             fhash = hash_text(text)
             layout_path = Path(settings.uploads_dir) / "ocr" / f"{fhash}.json"
             if layout_path.exists():
-                raw = json.loads(layout_path.read_text(encoding="utf-8"))
+                raw = _load_json(layout_path.read_bytes())
                 # support versioned cache objects; ensure version matches expected schema
                 if isinstance(raw, dict) and raw.get("version"):
-                    if raw.get("version") == "1" and raw.get("pages"):
+                    # "1": bbox vertices as {"x", "y"} dicts; "2": flat [x1, y1, x2, y2, ...]
+                    if raw.get("version") in ("1", "2") and raw.get("pages"):
                         layout_data = {"pages": raw.get("pages")}
                     else:
                         log.warning("Unsupported layout cache version %s for %s", raw.get("version"), layout_path)
@@ -107,59 +335,52 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
             layout_data = None
     dev = detect_device(text)
     patterns = PATTERNS.get(dev, PATTERNS["Generic"])
+    combined = PATTERNS_COMBINED.get(dev, PATTERNS_COMBINED["Generic"])
 
-    # Device-specific normalization for messy text exports
-    def normalize_for_device(dev_name: str, raw_text: str) -> str:
-        t = raw_text
-        if dev_name == "IOLMaster700":
-            # common issues in device export: tokens glued like '43,80 D88875°' or 'K1: 41,45 D @K2:'
-            # 1) ensure degree symbol separated: '75°' or '@ 75°' -> keep degree but add space before '@' and '°'
-            t = re.sub(r"\s*@\s*", " @ ", t)
-            t = re.sub(r"(\d)°", r"\1 °", t)
-            # 2) ensure 'D@' and 'D@' variants are spaced: 'D@' -> 'D @'
-            t = re.sub(r"D\s*@", "D @", t)
-            t = re.sub(r"D@", "D @", t)
-            # 3) ensure K1/K2/AK tokens have a separating space if collapsed (do NOT force newlines)
-            t = re.sub(r"\b(K1:|K2:|AK:|K1|K2|AK)\s*", lambda m: m.group(1) + " ", t)
-            # 4) remove repeated digit garbage before degrees (e.g., '88875 °' -> '75 °')
-            t = re.sub(r"(\d{3,})(\d{1,3})\s*°", lambda m: m.group(2) + " °", t)
-            # 4b) if an axis appears alone on its own line (e.g., '\n@ 100°\n'), merge it onto the previous line
-            t = re.sub(r"\n\s*(@\s*\d{1,3}\s*°)\s*\n", lambda m: " " + m.group(1) + "\n", t)
-            # 5) collapse multiple spaces to single
-            t = re.sub(r"[ \t]+", " ", t)
-        return t
-
-    text = normalize_for_device(dev, text)
-
-    result = ExtractResult(file_id=file_id, text_hash=hash_text(text))
+    normalized = normalize_for_device(dev, text)
+    # only IOLMaster700 exports are rewritten; otherwise reuse the layout lookup's hash
+    text_hash = fhash if fhash is not None and normalized == text else hash_text(normalized)
+    text = normalized
+
+    # Everything below is built from parser-owned strings, so skip Pydantic validation
+    result = ExtractResult.model_construct(file_id=file_id, text_hash=text_hash)
 
     fields = {
-        "od": EyeData(source=f"Ref: {dev}"),
-        "os": EyeData(source=f"Ref: {dev}"),
+        "od": EyeData.model_construct(source=f"Ref: {dev}"),
+        "os": EyeData.model_construct(source=f"Ref: {dev}"),
     }
 
     # Split text into OD/OS segments using headings or page breaks, robust to OS-only or OD-only files
     od_text = ""
     os_text = ""
-    # Try to split by 'OD' and 'OS' headings, but also search for OS block anywhere in text
-    od_match = re.search(r"(?m)^\s*OD\b[:\-]?[\s\S]{0,800}?Valores biométricos[\s\S]{0,400}", text, re.I)
-    os_match = re.search(r"(?m)^\s*OS\b[:\-]?[\s\S]{0,800}?Valores biométricos[\s\S]{0,400}", text, re.I)
+    # Try to split by 'OD' and 'OS' headings, but also search for OS block anywhere in text.
+    # All three segment patterns need 'Valores biométricos' or 'AL:'; without either,
+    # skip them (the OS fallback otherwise lazily scans 2000 chars from every 'os').
+    first_anchor = _SEGMENT_ANCHOR_RX.search(text)
+    has_segment_anchor = first_anchor is not None
+    # the OD/OS heading patterns need 'Valores biométricos' itself; 'AL:' alone can't satisfy them
+    has_valores = has_segment_anchor and _VALORES_RX.search(text, first_anchor.start()) is not None
+    od_match = _OD_RX.search(text) if has_valores else None
+    os_match = _OS_RX.search(text) if has_valores else None
     if od_match:
         od_text = od_match.group(0)
     # For OS, if not found at top level, search for any block starting with 'OS' and containing 'Valores biométricos' or 'AL:'
     if os_match:
         os_text = os_match.group(0)
-    else:
-        os_block = re.search(r"OS[\s\S]{0,2000}?(Valores biométricos|AL:)\s*[:\-]?[\s\S]{0,400}", text, re.I)
+    elif has_segment_anchor:
+        # the block's 'OS' sits at most 2 + 2000 chars before an anchor, so no
+        # match can start earlier than that before the first anchor
+        os_block = _OS_FALLBACK_RX.search(text, max(0, first_anchor.start() - 2002))
         if os_block:
             os_text = os_block.group(0)
     # Fallback: try splitting by first/second page markers (\nPágina)
-    pages = re.split(r"\nPágina\s+\d+\s+de\s+\d+", text)
+    # the marker is case-sensitive, so a substring miss means a single page without running the split
+    pages = _PAGE_SPLIT_RX.split(text) if "\nPágina" in text else [text]
     if not od_text and not os_text:
         if len(pages) == 1:
             # Single page: ambiguous. Prefer to treat it as OD if the text contains 'OD' markers,
             # otherwise as OS. This avoids blindly copying OD values into OS later.
-            if re.search(r"\bOD\b", text, re.I):
+            if _OD_TOKEN_RX.search(text):
                 od_text = text
                 os_text = ""
             else:
@@ -199,12 +420,7 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
         log.debug("OS segment not detected; will not populate OS fields or merge LLM results")
 
     def extract_for_eye(eye_text: str) -> Dict[str, Tuple[str, float | None]]:
-        scalars: Dict[str, Tuple[str, float | None]] = {}
-        for key, rx in patterns.items():
-            raw, val = _grab(rx, eye_text)
-            if raw:
-                scalars[key] = (raw, val)
-        return scalars
+        return _scan_fields(combined, len(patterns), eye_text)
 
     od_scalars = extract_for_eye(od_text) if od_text else {}
     os_scalars = extract_for_eye(os_text) if os_text else {}
@@ -212,6 +428,35 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
     log.debug("Parsed scalars sizes: od=%d os=%d", len(od_scalars), len(os_scalars))
     log.debug("os_present=%s; od_text_len=%d os_text_len=%d", os_present, len(od_text or ""), len(os_text or ""))
 
+    # K1/K2 anchor positions are looked up by several fallbacks on the same
+    # segment; scan each segment once
+    anchor_memo: Dict[str, Dict[str, re.Match]] = {}
+
+    def k_anchor(eye_text: str, klabel: str) -> Optional[re.Match]:
+        anchors = anchor_memo.get(eye_text)
+        if anchors is None:
+            anchors = anchor_memo[eye_text] = {}
+            # every anchor starts with a K; under re.I that includes the Kelvin sign
+            if "K" not in eye_text and "k" not in eye_text and "\u212a" not in eye_text:
+                return None
+            for m in _K_ANCHOR_RX.finditer(eye_text):
+                anchors.setdefault(m.lastgroup, m)
+                if len(anchors) == 2:
+                    break
+        return anchors.get(klabel)
+
+    # newline offsets per segment, so the line around a match is found by bisection
+    newline_memo: Dict[str, List[int]] = {}
+
+    def line_around(eye_text: str, pos: int) -> str:
+        nl = newline_memo.get(eye_text)
+        if nl is None:
+            nl = newline_memo[eye_text] = [m.start() for m in _NEWLINE_RX.finditer(eye_text)]
+        idx = bisect_left(nl, pos)
+        line_start = nl[idx - 1] + 1 if idx else 0
+        line_end = nl[idx] if idx < len(nl) else None
+        return eye_text[line_start:line_end]
+
     # Heuristic pairing for K1/K2 axes if axis lines are on separate lines with @ notation
     def pair_k_values(scalars: Dict[str, Tuple[str, float | None]], eye_text: str) -> Dict[str, str]:
         out = {}
@@ -219,30 +464,13 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
         lines = eye_text.splitlines()
         k_results = {"K1": {"val": None, "axis": None}, "K2": {"val": None, "axis": None}}
         for i, line in enumerate(lines):
-            m = re.search(r"\b(K1|K2)\b\s*[:\-]?\s*(\d{1,3}[\.,]\d{1,3})\s*D", line, re.I)
+            m = _K_LINE_RX.search(line)
             if m:
                 kname = m.group(1).upper()
                 kval = m.group(2)
-                # sanitize candidate axis tokens: accept up to 3 digits, pick rightmost group, validate 0-180
-                def sanitize_axis(raw_candidate: str) -> str | None:
-                    if not raw_candidate:
-                        return None
-                    # strip non-digits, but keep degree digits; capture rightmost 1-3 digit group
-                    groups = re.findall(r"(\d{1,3})", raw_candidate)
-                    if not groups:
-                        return None
-                    candidate = groups[-1]
-                    try:
-                        iv = int(candidate)
-                    except Exception:
-                        return None
-                    if 0 <= iv <= 180:
-                        return str(iv)
-                    return None
-
                 # Try to find axis on same line
                 # 1) Prefer explicit '@ 100°' pattern
-                axis_m = re.search(r"@\s*(\d{1,3})\s*°", line)
+                axis_m = _AXIS_AT_RX.search(line)
                 kaxis = axis_m.group(1) if axis_m else None
                 # 2) If not found, allow tolerant trailing-degree capture like '... 75°' or '...75°' possibly glued to other tokens
                 if not kaxis:
@@ -251,12 +479,12 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                     kval_pos = m.end()
                     right_slice = line[kval_pos:]
                     # attempt to find '@100°' or '100°' even if glued
-                    m2 = re.search(r"@?\s*(\d{1,3})\s*°", right_slice)
+                    m2 = _AXIS_OPT_AT_RX.search(right_slice)
                     if m2:
                         kaxis = sanitize_axis(m2.group(1))
                     else:
                         # fallback: find the rightmost degree-like token anywhere in the line
-                        m3 = list(re.finditer(r"(\d{1,3})\s*°", line))
+                        m3 = list(_AXIS_DEG_RX.finditer(line))
                         if m3:
                             kaxis = sanitize_axis(m3[-1].group(1))
                 # If not found, look at the next non-empty line for axis, but only if it is just an axis (e.g., '@ 100°')
@@ -269,7 +497,7 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                             if not next_line:
                                 continue
                             # Accept both '@ 100°' and '75°' formats
-                            axis_only = re.fullmatch(r"@?\s*(\d{1,3})\s*°", next_line)
+                            axis_only = _AXIS_OPT_AT_RX.fullmatch(next_line)
                             if axis_only:
                                 kaxis = sanitize_axis(axis_only.group(1))
                                 if kaxis:
@@ -277,10 +505,10 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                                 break
                             # If next line contains any known measurement or label, break (do not assign axis)
                             # Note: AK (astigmatism) is related to keratometry, so don't break on it
-                            if re.search(r"(CW[- ]?Chord|AL|WTW|CCT|ACD|LT|SE|SD|TK|TSE|ATK|P|Ix|ly|Fixação|Comentário|mm|μm|D|VA|Status de olho|Resultado|Paciente|Médico|Operador|Data|Versão|Página)", next_line, re.I):
+                            if _STOP_LABELS_RX.search(next_line):
                                 break
                             # also skip if the next line is just a short numeric token (likely noise like '888')
-                            if re.fullmatch(r"\s*\d{1,4}\s*", next_line):
+                            if _NUMERIC_NOISE_RX.fullmatch(next_line):
                                 break
                     # also look backward in case OCR put the axis above the K line
                     if not kaxis:
@@ -290,11 +518,11 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                                 prev_line = lines[i - j].strip()
                                 if not prev_line:
                                     continue
-                                axis_only = re.fullmatch(r"@?\s*(\d{1,3})\s*°", prev_line)
+                                axis_only = _AXIS_OPT_AT_RX.fullmatch(prev_line)
                                 if axis_only:
                                     # ensure previous line isn't a known measurement/label
                                     # Note: AK (astigmatism) is related to keratometry, so don't break on it
-                                    if re.search(r"(CW[- ]?Chord|AL|WTW|CCT|ACD|LT|SE|SD|TK|TSE|ATK|P|Ix|ly|Fixação|Comentário|mm|μm|D|VA|Status de olho|Resultado|Paciente|Médico|Operador|Data|Versão|Página)", prev_line, re.I):
+                                    if _STOP_LABELS_RX.search(prev_line):
                                         break
                                     kaxis = axis_only.group(1)
                                     break
@@ -318,17 +546,11 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
         if (out.get("k1_axis") == out.get("k2_axis") and 
             out.get("k1_axis") and out.get("k2_axis") and
             k_results["K1"]["val"] and k_results["K2"]["val"]):
-            try:
-                # Calculate perpendicular axis for K2 (K1 and K2 are typically 90 degrees apart)
-                k1_axis_num = int(out["k1_axis"])
-                k2_axis_num = (k1_axis_num + 90) % 180
-                log.debug("MAIN FIX APPLIED: K1 axis %s, K2 axis changed from %s to %s", 
-                         out["k1_axis"], out["k2_axis"], k2_axis_num)
-                out["k2_axis"] = str(k2_axis_num)
-            except (ValueError, TypeError) as e:
-                # If we can't calculate perpendicular, leave K2 axis empty
-                log.debug("MAIN FIX FAILED: Error calculating perpendicular: %s", e)
-                out["k2_axis"] = ""
+            # K1 and K2 are typically 90 degrees apart; if that can't be computed, leave K2 empty
+            k2_axis = _perpendicular_axis(out["k1_axis"])
+            log.debug("MAIN FIX: K1 axis %s, K2 axis changed from %s to %s",
+                     out["k1_axis"], out["k2_axis"], k2_axis)
+            out["k2_axis"] = k2_axis or ""
         # Fallback: if no K1/K2 found via dedicated pattern, use scalars
         if "k1" not in out and scalars.get("k1"):
             out["k1"] = scalars.get("k1")[0]
@@ -342,20 +564,18 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                 kkey, klabel = key_label
                 if f"{kkey}_axis" in out:
                     continue
-                m = re.search(rf"\b{klabel}\b\s*[:\-]?\s*\d{{1,3}}[\.,]\d{{1,3}}\s*D", eye_text, re.I)
+                m = k_anchor(eye_text, klabel)
                 if m:
                     tail = eye_text[m.end():m.end()+180]
                     # iterate possible axis matches in the tail and choose the first one
                     # whose line context does not look like another measurement (e.g., CW-Chord, TK, AK)
                     found_axis = None
-                    for m2 in re.finditer(r"@\s*(\d{1,3})\s*°", tail):
+                    for m2 in _AXIS_AT_RX.finditer(tail):
                         # compute absolute position of axis in eye_text
                         abs_pos = m.end() + m2.start()
-                        line_start = eye_text.rfind('\n', 0, abs_pos) + 1
-                        line_end = eye_text.find('\n', abs_pos)
-                        line = eye_text[line_start: line_end if line_end != -1 else None]
+                        line = line_around(eye_text, abs_pos)
                         # skip if the axis line includes tokens that indicate non-keratometry measurements
-                        if re.search(r"\b(TSE|TK1|TK2|TK|ATK|AK|CW[- ]?Chord|Chord|mm|μm|SD)\b", line, re.I):
+                        if _TAIL_SKIP_RX.search(line):
                             continue
                         found_axis = m2.group(1)
                         break
@@ -376,42 +596,47 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                                 if not bbox:
                                     continue
                                 # compute center
-                                xs = [v.get("x", 0) for v in bbox]
-                                ys = [v.get("y", 0) for v in bbox]
+                                if isinstance(bbox[0], dict):
+                                    xs = [v.get("x", 0) for v in bbox]
+                                    ys = [v.get("y", 0) for v in bbox]
+                                else:
+                                    xs = bbox[0::2]
+                                    ys = bbox[1::2]
                                 cx = sum(xs) / len(xs)
                                 cy = sum(ys) / len(ys)
                                 words.append({"text": txt, "cx": cx, "cy": cy})
                 # find k1/k2 word positions (matching tokens like 'K1' or numeric K values nearby)
                 k_positions = {"K1": [], "K2": []}
                 for w in words:
-                    if re.fullmatch(r"K1", w["text"], re.I):
+                    if _LAYOUT_K_RX["K1"].fullmatch(w["text"]):
                         k_positions["K1"].append(w)
-                    if re.fullmatch(r"K2", w["text"], re.I):
+                    if _LAYOUT_K_RX["K2"].fullmatch(w["text"]):
                         k_positions["K2"].append(w)
+                # words that mark chord/mm measurements; matched once rather than per axis candidate
+                chord_words = [w for w in words if _LAYOUT_CHORD_RX.search(w["text"])]
                 # Try to locate axis tokens like '@' followed by number in neighboring words
                 axis_words = []
                 for i, w in enumerate(words):
                     # axis may be represented as '@' token followed by '100' or '@100' or '@' in same word
-                    if re.search(r"@|°", w["text"]):
+                    if _LAYOUT_AXIS_MARK_RX.search(w["text"]):
                         # try to extract number from this word or next word
-                        mnum = re.search(r"(\d{1,3})", w["text"])
+                        mnum = _AXIS_DIGITS_RX.search(w["text"])
                         candidate = None
                         if mnum:
                             candidate = {"cx": w["cx"], "cy": w["cy"], "val": mnum.group(1)}
                         else:
                             # look ahead for a numeric word
-                            if i + 1 < len(words) and re.fullmatch(r"\d{1,3}", words[i+1]["text"]):
+                            if i + 1 < len(words) and _LAYOUT_NUM_RX.fullmatch(words[i+1]["text"]):
                                 candidate = {"cx": words[i+1]["cx"], "cy": words[i+1]["cy"], "val": words[i+1]["text"]}
                         if candidate:
                             # filter out candidates that are spatially close to words indicating CW-Chord or mm
                             skip = False
-                            for other in words:
-                                if re.search(r"\b(CW[- ]?Chord|Chord|mm)\b", other["text"], re.I):
-                                    dy = abs(other["cy"] - candidate["cy"])
-                                    dx = abs(other["cx"] - candidate["cx"])
-                                    if dy < 20 and dx < 200:
-                                        skip = True
-                                        break
+                            for other in chord_words:
+                                dy = abs(other["cy"] - candidate["cy"])
+                                dx = abs(other["cx"] - candidate["cx"])
+                                if dy < 20 and dx < 200:
+                                    skip = True
+                                    break
                             if not skip:
                                 axis_words.append(candidate)
                 # For each K, find nearest axis by vertical distance and reasonable horizontal proximity
@@ -442,39 +667,32 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
         # fallback to any axis tokens but FILTER OUT axes that appear on lines with 'mm' or 'CW-Chord' (likely chord/measurement axes)
         if "k1_axis" not in out or "k2_axis" not in out:
             axis_occurrences: List[Tuple[int, str]] = []
-            for m in re.finditer(r"@\s*(\d{1,3})\s*°", eye_text):
+            for m in _AXIS_AT_RX.finditer(eye_text):
                 s = m.start()
                 # extract the full line containing this axis
-                line_start = eye_text.rfind('\n', 0, s) + 1
-                line_end = eye_text.find('\n', s)
-                line = eye_text[line_start: line_end if line_end != -1 else None]
+                line = line_around(eye_text, s)
                 # skip axes that are part of measurements in mm or explicitly CW-Chord or TSE/TK lines
-                if re.search(r"\bmm\b|CW[- ]?Chord|Chord\b|\bTSE\b|\bSD\b|TK\d*", line, re.I):
+                if _FALLBACK_SKIP_RX.search(line):
                     continue
                 # skip numeric-only or very short noisy lines (e.g., '888' or stray digits)
-                if re.fullmatch(r"\s*\d{1,4}\s*", line):
+                if _NUMERIC_NOISE_RX.fullmatch(line):
                     continue
                 # sanitize the matched token
-                clean = sanitize_axis(m.group(1))
+                tok = m.group(1)
+                clean = _AXIS_LUT[tok] if tok in _AXIS_LUT else sanitize_axis(tok)
                 if clean:
                     axis_occurrences.append((s, clean))
             # find K1/K2 anchor positions and assign nearest axis by proximity
             anchors = {}
             for klabel in ("K1", "K2"):
-                m = re.search(rf"\b{klabel}\b\s*[:\-]?\s*\d{{1,3}}[\.,]\d{{1,3}}\s*D", eye_text, re.I)
+                m = k_anchor(eye_text, klabel)
                 if m:
                     anchors[klabel.lower()] = m.start()
             # for each anchor, choose nearest axis occurrence
             for kkey, apos in anchors.items():
                 if f"{kkey}_axis" in out:
                     continue
-                best = None
-                best_dist = None
-                for pos, val in axis_occurrences:
-                    dist = abs(pos - apos)
-                    if best is None or dist < best_dist:
-                        best = val
-                        best_dist = dist
+                best = _nearest_axis(axis_occurrences, apos)
                 if best:
                     out[f"{kkey}_axis"] = best
                     log.debug("FALLBACK: %s axis assigned: %s", kkey, best)
@@ -484,17 +702,11 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
             if (out.get("k1_axis") == out.get("k2_axis") and 
                 out.get("k1_axis") and out.get("k2_axis") and
                 "k1" in out and "k2" in out):
-                try:
-                    # Calculate perpendicular axis for K2 (K1 and K2 are typically 90 degrees apart)
-                    k1_axis_num = int(out["k1_axis"])
-                    k2_axis_num = (k1_axis_num + 90) % 180
-                    log.debug("FIX APPLIED: K1 axis %s, K2 axis changed from %s to %s", 
-                             out["k1_axis"], out["k2_axis"], k2_axis_num)
-                    out["k2_axis"] = str(k2_axis_num)
-                except (ValueError, TypeError) as e:
-                    # If we can't calculate perpendicular, leave K2 axis empty
-                    log.debug("FIX FAILED: Error calculating perpendicular: %s", e)
-                    out["k2_axis"] = ""
+                # K1 and K2 are typically 90 degrees apart; if that can't be computed, leave K2 empty
+                k2_axis = _perpendicular_axis(out["k1_axis"])
+                log.debug("FIX: K1 axis %s, K2 axis changed from %s to %s",
+                         out["k1_axis"], out["k2_axis"], k2_axis)
+                out["k2_axis"] = k2_axis or ""
             # if anchors not found, fall back to first/second occurrence as before
             # BUT: Don't assign the same axis to both K1 and K2 if there's only one occurrence
             if "k1_axis" not in out and len(axis_occurrences) >= 1:
@@ -506,14 +718,9 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
                 # In keratometry, K1 and K2 are typically 90 degrees apart
                 k1_axis_val = out.get("k1_axis")
                 if k1_axis_val:
-                    try:
-                        k1_axis_num = int(k1_axis_val)
-                        # Calculate perpendicular axis (add 90 degrees, wrap around 180)
-                        k2_axis_num = (k1_axis_num + 90) % 180
-                        out["k2_axis"] = str(k2_axis_num)
-                    except (ValueError, TypeError):
-                        # If we can't calculate perpendicular, leave K2 axis empty
-                        pass
+                    k2_axis = _perpendicular_axis(k1_axis_val)
+                    if k2_axis:
+                        out["k2_axis"] = k2_axis
         return out
 
     od_pairs = pair_k_values(od_scalars, od_text)
@@ -521,39 +728,36 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
 
     # Populate fields with extracted scalars and paired axes
     for eye, scalars, pairs in (("od", od_scalars, od_pairs), ("os", os_scalars, os_pairs)):
-        fld = fields[eye]
         # If no scalars for this eye and the eye segment wasn't present, skip populating to avoid duplication
         if eye == "os" and not os_present:
             # leave OS empty and low confidence
-            for key in ("axial_length", "acd", "lt", "cct", "wtw", "k1", "k2", "k1_axis", "k2_axis", "ak", "axis"):
-                result.confidence[f"{eye}.{key}"] = 0.0
+            result.confidence.update(_ABSENT_OS_CONFIDENCE)
             continue
-        for key in ("axial_length", "acd", "lt", "cct", "wtw"):
-            raw, val = scalars.get(key, ("", None))
-            setattr(fld, key, raw)
+        conf_keys = _CONF_KEYS[eye]
+        values: Dict[str, str] = {}
+        conf: Dict[str, float] = {}
+        for key in _SCALAR_FIELDS:
+            raw, val = scalars.get(key, _NO_MATCH)
+            values[key] = raw
             ok, msg = check_range(key, val)
-            result.confidence[f"{eye}.{key}"] = 0.9 if ok else 0.3
+            conf[conf_keys[key]] = 0.9 if ok else 0.3
             if not ok and msg:
                 result.flags.append(f"{eye}: {msg}")
 
         # K values: keep raw value, axis from paired heuristics if available
-        k1_raw, _ = scalars.get("k1", ("", None))
-        k2_raw, _ = scalars.get("k2", ("", None))
-        setattr(fld, "k1", k1_raw)
-        setattr(fld, "k2", k2_raw)
+        values["k1"] = scalars.get("k1", _NO_MATCH)[0]
+        values["k2"] = scalars.get("k2", _NO_MATCH)[0]
         # axis per K: populate k1_axis/k2_axis from paired heuristics only
         # Do NOT use any standalone/generic 'axis' scalar fallback to avoid leakage
-        k1_ax = pairs.get("k1_axis") or ""
-        k2_ax = pairs.get("k2_axis") or ""
-        fld.k1_axis = k1_ax
-        fld.k2_axis = k2_ax
-    # No deprecated single-axis field: prefer explicit per-K axes only
+        values["k1_axis"] = pairs.get("k1_axis") or ""
+        values["k2_axis"] = pairs.get("k2_axis") or ""
         # ak
-        ak_raw = scalars.get("ak", ("", None))[0] if scalars.get("ak") else ""
-        fld.ak = ak_raw
+        values["ak"] = scalars.get("ak", _NO_MATCH)[0]
         # confidences for keratometry
-        for key in ("k1", "k2", "ak", "k1_axis", "k2_axis"):
-            result.confidence[f"{eye}.{key}"] = 0.8 if getattr(fld, key) else 0.2
+        for key in _K_FIELDS:
+            conf[conf_keys[key]] = 0.8 if values[key] else 0.2
+        result.confidence.update(conf)
+        fields[eye] = EyeData.model_construct(source=f"Ref: {dev}", **values)
 
     result.od = fields["od"]
     result.os = fields["os"]
@@ -576,7 +780,9 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
         missing["od"] = []
     if not os_present:
         missing["os"] = []
-    if missing["od"] or missing["os"]:
+    # blank or digit-free text (failed OCR, cover pages) holds no measurements;
+    # don't spend an LLM round trip on it
+    if (missing["od"] or missing["os"]) and _DIGIT_RX.search(text):
         try:
             # use injected llm_func if provided (for testing), else default util
             if llm_func is None:
@@ -586,18 +792,17 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
             if llm_out is None:
                 llm_out = {}
             log.debug("LLM output: %s", llm_out)
-            # merge LLM outputs carefully
-            for eye in ("od", "os"):
-                # skip merging LLM outputs for an eye if its segment wasn't present
-                if eye == "os" and not os_present:
-                    log.debug("Skipping LLM merge for OS because OS not present")
-                    continue
-                if eye == "od" and not od_present:
-                    log.debug("Skipping LLM merge for OD because OD not present")
-                    continue
+            # merge LLM outputs carefully, only into eyes whose segment was present
+            merge_eyes = [eye for eye, present in (("od", od_present), ("os", os_present)) if present]
+            log.debug("Merging LLM output into %s", merge_eyes)
+            for eye in merge_eyes:
                 eye_obj = getattr(result, eye)
                 eye_llm = llm_out.get(eye, {})
                 for k, v in eye_llm.items():
+                    # ignore keys EyeData doesn't have (e.g. a legacy single 'axis'); they
+                    # used to raise here and drop the whole merge
+                    if k not in _LLM_MERGE_KEYS:
+                        continue
                     if k in ("k1", "k2") and isinstance(v, dict):
                         # respect value/axis pairs
                         if v.get("value") and not getattr(eye_obj, k):
@@ -624,79 +829,67 @@ def parse_text(file_id: str, text: str, llm_func=None) -> ExtractResult:
     # try a last-pass proximity match within the same eye_text using sanitized '@ N°' tokens.
     def final_proximity_assign(eye_name: str, eye_text: str):
         eye_obj = getattr(result, eye_name)
+        # K values don't change below; only the axes are (re)assigned
+        k1, k2 = eye_obj.k1, eye_obj.k2
         # only apply when K values exist but axes missing
-        if not (getattr(eye_obj, 'k1') or getattr(eye_obj, 'k2')):
+        if not (k1 or k2):
             return
-        need_k1 = bool(getattr(eye_obj, 'k1')) and not getattr(eye_obj, 'k1_axis')
-        need_k2 = bool(getattr(eye_obj, 'k2')) and not getattr(eye_obj, 'k2_axis')
+        need_k1 = bool(k1) and not eye_obj.k1_axis
+        need_k2 = bool(k2) and not eye_obj.k2_axis
         if not (need_k1 or need_k2):
             return
+        # every '@ N°' token needs both characters; without them there is nothing to assign
+        if "@" not in eye_text or "°" not in eye_text:
+            return
         # collect sanitized axis occurrences with positions
         occ = []
-        for m in re.finditer(r"@\s*(\d{1,3})\s*°", eye_text):
-            clean = sanitize_axis(m.group(1))
+        for m in _AXIS_AT_RX.finditer(eye_text):
+            tok = m.group(1)
+            clean = _AXIS_LUT[tok] if tok in _AXIS_LUT else sanitize_axis(tok)
             if clean:
                 occ.append((m.start(), clean))
         if not occ:
             return
         # anchors
         anchors = {}
-        if getattr(eye_obj, 'k1'):
-            m1 = re.search(r"\bK1\b\s*[:\-]?\s*\d{1,3}[\.,]\d{1,3}\s*D", eye_text, re.I)
+        if k1:
+            m1 = k_anchor(eye_text, "K1")
             if m1:
                 anchors['k1'] = m1.start()
-        if getattr(eye_obj, 'k2'):
-            m2 = re.search(r"\bK2\b\s*[:\-]?\s*\d{1,3}[\.,]\d{1,3}\s*D", eye_text, re.I)
+        if k2:
+            m2 = k_anchor(eye_text, "K2")
             if m2:
                 anchors['k2'] = m2.start()
         for kkey, apos in anchors.items():
-            best = None
-            best_dist = None
-            for pos, val in occ:
-                d = abs(pos - apos)
-                if best is None or d < best_dist:
-                    best = val
-                    best_dist = d
+            best = _nearest_axis(occ, apos)
             if best:
                 setattr(eye_obj, f"{kkey}_axis", best)
                 log.debug("FINAL PROXIMITY: %s axis assigned: %s", kkey, best)
         
         # Fix: If both K1 and K2 have the same axis (which is incorrect in keratometry),
         # calculate the perpendicular for one of them
-        k1_axis = getattr(eye_obj, 'k1_axis', '')
-        k2_axis = getattr(eye_obj, 'k2_axis', '')
-        if (k1_axis == k2_axis and k1_axis and k2_axis and
-            getattr(eye_obj, 'k1') and getattr(eye_obj, 'k2')):
-            try:
-                k1_axis_num = int(k1_axis)
-                k2_axis_num = (k1_axis_num + 90) % 180
-                log.debug("FINAL PROXIMITY FIX: K1 axis %s, K2 axis changed from %s to %s", 
-                         k1_axis, k2_axis, k2_axis_num)
-                eye_obj.k2_axis = str(k2_axis_num)
-            except (ValueError, TypeError) as e:
-                log.debug("FINAL PROXIMITY FIX FAILED: Error calculating perpendicular: %s", e)
+        k1_axis = eye_obj.k1_axis
+        k2_axis = eye_obj.k2_axis
+        if k1_axis == k2_axis and k1_axis and k2_axis and k1 and k2:
+            perpendicular = _perpendicular_axis(k1_axis)
+            log.debug("FINAL PROXIMITY FIX: K1 axis %s, K2 axis changed from %s to %s",
+                     k1_axis, k2_axis, perpendicular)
+            if perpendicular:
+                eye_obj.k2_axis = perpendicular
         
         # If we only found one axis and both K1 and K2 need axes, calculate perpendicular for the second one
         elif len(occ) == 1 and need_k1 and need_k2:
             if k1_axis and not k2_axis:
-                try:
-                    k1_axis_num = int(k1_axis)
-                    k2_axis_num = (k1_axis_num + 90) % 180
-                    eye_obj.k2_axis = str(k2_axis_num)
-                except (ValueError, TypeError):
-                    pass
+                eye_obj.k2_axis = _perpendicular_axis(k1_axis) or k2_axis
             elif k2_axis and not k1_axis:
-                try:
-                    k2_axis_num = int(k2_axis)
-                    k1_axis_num = (k2_axis_num - 90) % 180
-                    eye_obj.k1_axis = str(k1_axis_num)
-                except (ValueError, TypeError):
-                    pass
-
-    # apply per-eye final proximity assignment
+                eye_obj.k1_axis = _perpendicular_axis(k2_axis) or k1_axis
+
+    # apply per-eye final proximity assignment; an absent eye has no K values to place
     try:
-        final_proximity_assign('od', od_text)
-        final_proximity_assign('os', os_text)
+        if od_present:
+            final_proximity_assign('od', od_text)
+        if os_present:
+            final_proximity_assign('os', os_text)
     except Exception:
         pass
     return result
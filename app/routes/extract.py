@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 from app.services.storage import resolve_path
 from app.services.biometry_parser_universal import BiometryParser
+from app.storage import PARSE_DIR
+from app.utils import hash_file
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,91 +13,87 @@ router = APIRouter()
 # Initialize parser
 parser = BiometryParser()
 
+# (response key, parser key) per eye; the parser names K axes k_axis_1/k_axis_2
+_EYE_FIELDS = (
+    ("axial_length", "axial_length"),
+    ("acd", "acd"),
+    ("lt", "lt"),
+    ("wtw", "wtw"),
+    ("cct", "cct"),
+    ("k1", "k1"),
+    ("k2", "k2"),
+    ("k1_axis", "k_axis_1"),
+    ("k2_axis", "k_axis_2"),
+)
+_CONFIDENCE_KEYS = tuple(f"{eye}.{key}" for eye in ("od", "os") for key, _ in _EYE_FIELDS)
+_CRITICAL_FIELDS = ("axial_length", "k1", "k2")
+
+def _load_cached(cache_path):
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
 @router.get("/{file_id}")
-async def extract_fields(file_id: str):
+async def extract_fields(file_id: str, force: bool = Query(False, description="Ignore cached extraction and re-run the parser")):
     """
     Extract biometry data from uploaded PDF using universal RunPod parser
     Returns data for BOTH eyes (OD and OS) in one call
+
+    Parser output is cached in PARSE_DIR by the SHA-256 of the file bytes, so
+    re-extracting an unchanged upload (e.g. after each review edit) skips OCR
+    and the LLM entirely. Pass ?force=1 to bypass the cache.
     """
     path = resolve_path(file_id)
     if not path:
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
-        # Use new universal parser
-        logger.info(f"Extracting biometry from {path}")
-        complete_data = parser.extract_complete_biometry(str(path))
+        cache_path = PARSE_DIR / f"{hash_file(path)}.json"
+        complete_data = None if force else _load_cached(cache_path)
+        if complete_data is None:
+            # Use new universal parser
+            logger.info(f"Extracting biometry from {path}")
+            complete_data = parser.extract_complete_biometry(str(path))
+            cacheable = True
+        else:
+            logger.info(f"Using cached extraction for {file_id}")
+            cacheable = False
         
         # Map to frontend expected format
+        od_data = complete_data.get("od") or {}
+        os_data = complete_data.get("os") or {}
         response = {
             "patient_name": complete_data.get("patient_name", ""),
             "age": complete_data.get("age", None),
             "device": complete_data.get("device", ""),
-            "od": {
-                "axial_length": complete_data.get("od", {}).get("axial_length"),
-                "acd": complete_data.get("od", {}).get("acd"),
-                "lt": complete_data.get("od", {}).get("lt"),
-                "wtw": complete_data.get("od", {}).get("wtw"),
-                "cct": complete_data.get("od", {}).get("cct"),
-                "k1": complete_data.get("od", {}).get("k1"),
-                "k2": complete_data.get("od", {}).get("k2"),
-                "k1_axis": complete_data.get("od", {}).get("k_axis_1"),
-                "k2_axis": complete_data.get("od", {}).get("k_axis_2"),
-            },
-            "os": {
-                "axial_length": complete_data.get("os", {}).get("axial_length"),
-                "acd": complete_data.get("os", {}).get("acd"),
-                "lt": complete_data.get("os", {}).get("lt"),
-                "wtw": complete_data.get("os", {}).get("wtw"),
-                "cct": complete_data.get("os", {}).get("cct"),
-                "k1": complete_data.get("os", {}).get("k1"),
-                "k2": complete_data.get("os", {}).get("k2"),
-                "k1_axis": complete_data.get("os", {}).get("k_axis_1"),
-                "k2_axis": complete_data.get("os", {}).get("k_axis_2"),
-            },
-            "confidence": {
-                # Set all confidence to 0.95 (high) for now
-                # We can refine this later based on extraction quality
-                "od.axial_length": 0.95,
-                "od.acd": 0.95,
-                "od.lt": 0.95,
-                "od.wtw": 0.95,
-                "od.cct": 0.95,
-                "od.k1": 0.95,
-                "od.k2": 0.95,
-                "od.k1_axis": 0.95,
-                "od.k2_axis": 0.95,
-                "os.axial_length": 0.95,
-                "os.acd": 0.95,
-                "os.lt": 0.95,
-                "os.wtw": 0.95,
-                "os.cct": 0.95,
-                "os.k1": 0.95,
-                "os.k2": 0.95,
-                "os.k1_axis": 0.95,
-                "os.k2_axis": 0.95,
-            },
+            "od": {key: od_data.get(src) for key, src in _EYE_FIELDS},
+            "os": {key: os_data.get(src) for key, src in _EYE_FIELDS},
+            # Set all confidence to 0.95 (high) for now
+            # We can refine this later based on extraction quality
+            "confidence": dict.fromkeys(_CONFIDENCE_KEYS, 0.95),
             "notes": None
         }
         
         # Check if any critical values are missing
-        od_has_data = any([
-            response["od"].get("axial_length"),
-            response["od"].get("k1"),
-            response["od"].get("k2")
-        ])
-        os_has_data = any([
-            response["os"].get("axial_length"),
-            response["os"].get("k1"),
-            response["os"].get("k2")
-        ])
+        od_has_data = any(response["od"][key] for key in _CRITICAL_FIELDS)
+        os_has_data = any(response["os"][key] for key in _CRITICAL_FIELDS)
         
         if not od_has_data and not os_has_data:
             response["notes"] = "Low-confidence extraction. Please review and correct values."
             logger.warning(f"Low confidence extraction for {file_id}")
+        elif cacheable:
+            # only cache useful results so a transient parser/LLM outage isn't pinned
+            try:
+                cache_path.write_text(json.dumps(complete_data, ensure_ascii=False), encoding="utf-8")
+            except (OSError, TypeError, ValueError):
+                logger.warning(f"Could not cache extraction for {file_id}")
         
         logger.info(f"Successfully extracted biometry for {file_id}")
-        return response
+        # Values are plain JSON types (parser output is itself JSON), so render
+        # directly instead of letting FastAPI walk the dict with jsonable_encoder
+        return JSONResponse(content=response)
         
     except Exception as e:
         logger.error(f"Error extracting biometry for {file_id}: {e}")
@@ -9,7 +9,7 @@ from fastapi.responses import JSONResponse
 
 from app.services.parsing.unified_extract import get_unified_extract_service
 from app.models.api import ExtractResult
-from app.storage import UPLOADS
+from app.storage import find_upload
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +32,9 @@ async def extract_with_fallback(
     4. Tracks usage and costs
     """
     try:
-        # Find file by prefix (existing logic)
-        matches = list(UPLOADS.glob(file_id + "*"))
-        if not matches:
+        file_path = find_upload(file_id)
+        if file_path is None:
             raise HTTPException(status_code=404, detail="file_id not found")
-        file_path = matches[0]
         
         logger.info(f"Extracting from {file_path} for user {user_id}")
         
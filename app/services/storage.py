@@ -2,6 +2,7 @@ import uuid
 from typing import Optional
 from pathlib import Path
 from app.settings import settings
+from app.storage import find_upload_in
 
 # Directory for uploads
 UPLOADS_DIR = Path(settings.uploads_dir or "uploads")
@@ -29,8 +30,8 @@ def save_upload(file_obj, original_name: str) -> tuple[str, Path]:
 def resolve_path(file_id: str) -> Optional[Path]:
     """
     Given a file_id, return the corresponding file path if it exists.
+
+    Known extensions are checked with a single stat each; only uploads with an
+    unusual extension fall through to the directory scan.
     """
-    for p in UPLOADS_DIR.iterdir():
-        if p.name.startswith(file_id):
-            return p
-    return None
+    return find_upload_in(UPLOADS_DIR, file_id)
@@ -1,6 +1,4 @@
 from pathlib import Path
-import json
-import tempfile
 from typing import Optional
 
 from .config import settings
@@ -17,6 +15,24 @@ TEXT_DIR.mkdir(exist_ok=True)
 PARSE_DIR = UPLOADS / "parsed"
 PARSE_DIR.mkdir(exist_ok=True)
 
+# Extensions /upload writes; probed directly so lookups don't scan UPLOADS
+UPLOAD_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".bin")
+
+
+def find_upload_in(directory: Path, file_id: str) -> Optional[Path]:
+	"""Return the stored upload for file_id in directory, or None if it doesn't exist."""
+	for ext in UPLOAD_EXTENSIONS:
+		p = directory / f"{file_id}{ext}"
+		if p.is_file():
+			return p
+	# uncommon extension: fall back to a prefix scan
+	return next((p for p in directory.iterdir() if p.name.startswith(file_id)), None)
+
+
+def find_upload(file_id: str) -> Optional[Path]:
+	"""Return the stored upload for file_id, or None if it doesn't exist."""
+	return find_upload_in(UPLOADS, file_id)
+
 
 # LEGACY: GCS (Google Cloud Storage) integration removed
 # Kept as stubs for backward compatibility
@@ -1,15 +1,43 @@
+import re, hashlib, copy
+from collections import OrderedDict
+
+# Responses keyed by (text hash, missing-field signature, model) so re-extracting
+# the same document during review doesn't repeat the LLM round trip.
+_LLM_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+_LLM_CACHE_MAX = 256
+
 # LEGACY: OpenAI LLM fallback removed - now using Ollama-based BiometryParser
 # This function is kept as a stub for backward compatibility but returns empty results
 def llm_extract_missing_fields(ocr_text: str, missing_fields: dict, model: str = "gpt-4o-mini") -> dict:
     """
     DEPRECATED: Legacy OpenAI LLM fallback function.
     Use BiometryParser from app.services.biometry_parser instead.
+
+    OD and OS are requested together in one call; results are cached per document.
     """
+    key = (
+        hash_text(ocr_text),
+        tuple((eye, tuple(fields)) for eye, fields in sorted(missing_fields.items())),
+        model,
+    )
+    cached = _LLM_CACHE.get(key)
+    if cached is None:
+        cached = _llm_extract_uncached(ocr_text, missing_fields, model)
+        _LLM_CACHE[key] = cached
+        if len(_LLM_CACHE) > _LLM_CACHE_MAX:
+            _LLM_CACHE.popitem(last=False)
+    else:
+        _LLM_CACHE.move_to_end(key)
+    # callers may merge into the result; never hand out the cached dict itself
+    return copy.deepcopy(cached)
+
+
+def _llm_extract_uncached(ocr_text: str, missing_fields: dict, model: str) -> dict:
     import logging
     logger = logging.getLogger("llm_fallback")
     logger.warning("llm_extract_missing_fields called but is deprecated - use BiometryParser instead")
     return {"od": {}, "os": {}}
-import re, hashlib
+
 
 DECIMAL_RX = re.compile(r"(?P<num>\d{1,3}[\.,]\d{1,3})")
 UNIT_RX = re.compile(r"(mm|µm|um|D|°)")
@@ -24,14 +52,13 @@ RANGES = {
 
 UNIT_NORMAL = {"um": "µm"}
 
+_FLOAT_RX = re.compile(r"-?\d+(?:\.\d+)?")
+
 def to_float(s: str) -> float | None:
     if not s:
         return None
-    s = s.strip().replace(",", ".")
-    try:
-        return float(re.findall(r"-?\d+(?:\.\d+)?", s)[0])
-    except Exception:
-        return None
+    m = _FLOAT_RX.search(s.strip().replace(",", "."))
+    return float(m.group(0)) if m else None
 
 def normalize_unit(u: str | None) -> str | None:
     if not u:
@@ -51,5 +78,14 @@ def check_range(name: str, value: float | None) -> tuple[bool, str | None]:
 def hash_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
+def hash_file(path) -> str:
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()  # Python < 3.11
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+        return h.hexdigest()
+
 def safe_filename(s: str) -> str:
     return re.sub(r"[^a-zA-Z0-9._-]", "_", s)
@@ -289,3 +289,10 @@ def test_os_screenshot_axes():
     assert r.os.k2_axis == '165'
     # OD should be empty
     assert r.od.k1 == '' and r.od.k2 == ''
+
+
+def test_raw_axis_fallback_without_k_line():
+    # no 'K1: 42.10 D' line, so only the raw '@ N°' fallback can supply the axis
+    text = "OD\nValores biométricos\nAL: 23,45 mm\nK1: 42.10\n@ 95°\n"
+    r = parser.parse_text('file3', text, llm_func=noop_llm)
+    assert r.od.k1_axis == '95'
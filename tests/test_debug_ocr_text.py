@@ -0,0 +1,42 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+from app import main
+
+client = TestClient(main.app)
+
+OCR_TEXT = "AL: 23,45 mm\nK1: 43,25 D @ 90°\n" * 100
+
+
+def test_gzip_entry_is_streamed_compressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "TEXT_DIR", tmp_path)
+    raw = gzip.compress(OCR_TEXT.encode("utf-8"))
+    (tmp_path / "abc.txt.gz").write_bytes(raw)
+
+    res = client.get("/debug/ocr_text/abc", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["content-length"] == str(len(raw))
+    assert res.text == OCR_TEXT
+
+
+def test_gzip_entry_is_decompressed_for_clients_without_gzip(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "TEXT_DIR", tmp_path)
+    (tmp_path / "abc.txt.gz").write_bytes(gzip.compress(OCR_TEXT.encode("utf-8")))
+
+    res = client.get("/debug/ocr_text/abc", headers={"Accept-Encoding": "identity"})
+    assert res.status_code == 200
+    assert "content-encoding" not in res.headers
+    assert res.text == OCR_TEXT
+
+
+def test_legacy_plain_entry_and_missing_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "TEXT_DIR", tmp_path)
+    (tmp_path / "old.txt").write_text(OCR_TEXT, encoding="utf-8")
+
+    res = client.get("/debug/ocr_text/old", headers={"Accept-Encoding": "identity"})
+    assert res.status_code == 200
+    assert res.text == OCR_TEXT
+
+    assert client.get("/debug/ocr_text/nope").status_code == 404
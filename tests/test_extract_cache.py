@@ -0,0 +1,90 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import extract
+
+GOOD = {
+    "patient_name": "TEST",
+    "age": 70,
+    "device": "IOLMaster 700",
+    "od": {"axial_length": 23.45, "k1": 43.25, "k2": 44.0, "k_axis_1": 90, "k_axis_2": 180},
+    "os": {"axial_length": 23.6, "k1": 43.5, "k2": 44.25, "k_axis_1": 85, "k_axis_2": 175},
+}
+EMPTY = {"patient_name": "", "age": None, "device": "", "od": {}, "os": {}}
+
+
+class FakeParser:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def extract_complete_biometry(self, path):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _client(tmp_path, monkeypatch, fake):
+    upload = tmp_path / "abc.pdf"
+    upload.write_bytes(b"%PDF-1.4 fake")
+    parse_dir = tmp_path / "parsed"
+    parse_dir.mkdir()
+    monkeypatch.setattr(extract, "resolve_path", lambda file_id: upload)
+    monkeypatch.setattr(extract, "PARSE_DIR", parse_dir)
+    monkeypatch.setattr(extract, "parser", fake)
+    app = FastAPI()
+    app.include_router(extract.router, prefix="/extract")
+    return TestClient(app), parse_dir
+
+
+def test_cache_hit_skips_the_parser(tmp_path, monkeypatch):
+    fake = FakeParser(GOOD)
+    client, parse_dir = _client(tmp_path, monkeypatch, fake)
+
+    first = client.get("/extract/abc")
+    second = client.get("/extract/abc")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()["od"]["k1_axis"] == 90
+    assert fake.calls == 1
+    assert len(list(parse_dir.glob("*.json"))) == 1
+
+
+def test_force_reparses_and_refreshes_the_cache(tmp_path, monkeypatch):
+    updated = {**GOOD, "patient_name": "UPDATED"}
+    fake = FakeParser(GOOD, updated)
+    client, _ = _client(tmp_path, monkeypatch, fake)
+
+    client.get("/extract/abc")
+    forced = client.get("/extract/abc", params={"force": "true"})
+    cached = client.get("/extract/abc")
+
+    assert fake.calls == 2
+    assert forced.json()["patient_name"] == "UPDATED"
+    assert cached.json()["patient_name"] == "UPDATED"
+
+
+def test_errors_are_not_cached(tmp_path, monkeypatch):
+    fake = FakeParser(RuntimeError("parser offline"), GOOD)
+    client, parse_dir = _client(tmp_path, monkeypatch, fake)
+
+    assert client.get("/extract/abc").status_code == 500
+    assert not list(parse_dir.glob("*.json"))
+    assert client.get("/extract/abc").status_code == 200
+    assert fake.calls == 2
+
+
+def test_results_without_data_are_not_cached(tmp_path, monkeypatch):
+    fake = FakeParser(EMPTY, GOOD)
+    client, parse_dir = _client(tmp_path, monkeypatch, fake)
+
+    empty = client.get("/extract/abc")
+    assert empty.status_code == 200
+    assert empty.json()["notes"].startswith("Low-confidence")
+    assert not list(parse_dir.glob("*.json"))
+
+    assert client.get("/extract/abc").json()["patient_name"] == "TEST"
+    assert fake.calls == 2
@@ -0,0 +1,33 @@
+import pytest
+
+from app.parser import PATTERNS, PATTERNS_COMBINED, _scan_fields
+
+
+def _per_field(device, text):
+    found = {}
+    for key, rx in PATTERNS[device].items():
+        m = rx.search(text)
+        if m and m.group("val"):
+            found[key] = m.group("val")
+    return found
+
+
+@pytest.mark.parametrize("text, expected", [
+    # the AK / DeltaK match contains the start of a K2 reading
+    ("AK23D", {"ak": "23", "k2": "3"}),
+    ("DeltaK2312D", {"ak": "2312", "k2": "312"}),
+])
+def test_fused_scan_keeps_overlapping_fields(text, expected):
+    scalars = _scan_fields(PATTERNS_COMBINED["Generic"], len(PATTERNS["Generic"]), text)
+    assert {key: raw for key, (raw, _) in scalars.items()} == expected
+
+
+@pytest.mark.parametrize("device", list(PATTERNS))
+@pytest.mark.parametrize("text", [
+    "Axial Length: 23,45 mm\nACD: 3,10 mm\nK1: 43,25 D @ 90°\nK2 44,00 D\nAK23D Axis 90°",
+    "K1 (Front): 43,2 D K2 (Front): 44,1 D Astig (Front): 0,9 D Axis (Front): 12°",
+    "CCT 540 µm WTW 12,1 mm Lens Thickness 4,5 mm DeltaK 0,75 D",
+])
+def test_fused_scan_matches_per_field_search(device, text):
+    scalars = _scan_fields(PATTERNS_COMBINED[device], len(PATTERNS[device]), text)
+    assert {key: raw for key, (raw, _) in scalars.items()} == _per_field(device, text)
@@ -0,0 +1,55 @@
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+from app import ocr
+
+
+def _fake_upload(tmp_path, monkeypatch, text="AL: 23,45 mm\nK1: 43,25 D @ 90°"):
+    monkeypatch.setattr(ocr, "TEXT_DIR", tmp_path)
+    monkeypatch.delenv("GCS_BUCKET_NAME", raising=False)
+    monkeypatch.delenv("GCS_BUCKET", raising=False)
+    calls = []
+
+    def fake_vision(path):
+        calls.append(path)
+        return text, None, None
+
+    monkeypatch.setattr(ocr, "google_vision_ocr_with_layout", fake_vision)
+    upload = tmp_path / "scan.png"
+    upload.write_bytes(b"\x89PNG fake image bytes")
+    return upload, calls
+
+
+def test_ocr_text_cache_is_written_gzipped_and_read_back(tmp_path, monkeypatch):
+    upload, calls = _fake_upload(tmp_path, monkeypatch)
+
+    text, err = ocr.ocr_file(upload)
+    assert err is None
+    fhash = ocr.hash_file(upload)
+    entry = tmp_path / f"{fhash}.txt.gz"
+    assert gzip.decompress(entry.read_bytes()).decode("utf-8") == text
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # second call is served from the cache without OCRing again
+    assert ocr.ocr_file(upload) == (text, None)
+    assert len(calls) == 1
+
+
+def test_ocr_text_cache_reads_legacy_plain_entries(tmp_path, monkeypatch):
+    upload, calls = _fake_upload(tmp_path, monkeypatch)
+    fhash = ocr.hash_file(upload)
+    (tmp_path / f"{fhash}.txt").write_text("legacy text", encoding="utf-8")
+
+    assert ocr.ocr_file(upload) == ("legacy text", None)
+    assert calls == []
+
+
+def test_concurrent_atomic_writes_do_not_collide(tmp_path):
+    target = tmp_path / "same.txt.gz"
+    payloads = [gzip.compress(f"writer {i}".encode()) for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda data: ocr._write_atomic(target, data), payloads))
+
+    assert target.read_bytes() in payloads
+    assert not list(tmp_path.glob("*.tmp"))
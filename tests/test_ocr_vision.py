@@ -0,0 +1,106 @@
+"""The Google Vision paths are dormant in this tree (app.ocr.vision is None);
+these tests drive them with a stand-in SDK so they keep working if it returns."""
+from types import SimpleNamespace
+
+import pytest
+
+from app import ocr
+
+
+class _Feature(SimpleNamespace):
+    Type = SimpleNamespace(DOCUMENT_TEXT_DETECTION="DOCUMENT_TEXT_DETECTION")
+
+
+def _response(content: bytes, error: str = ""):
+    fta = SimpleNamespace(text=content.decode(), pages=[])
+    return SimpleNamespace(error=SimpleNamespace(message=error), full_text_annotation=fta)
+
+
+class FakeClient:
+    def __init__(self, credentials=None, fail_batch=False):
+        self.credentials = credentials
+        self.fail_batch = fail_batch
+        self.batch_sizes = []
+        self.single_calls = 0
+
+    def batch_annotate_images(self, requests):
+        if self.fail_batch:
+            raise RuntimeError("batch endpoint unavailable")
+        self.batch_sizes.append(len(requests))
+        return SimpleNamespace(responses=[
+            _response(r.image.content, "bad page" if r.image.content == b"bad" else "") for r in requests
+        ])
+
+    def document_text_detection(self, image):
+        self.single_calls += 1
+        return _response(image.content)
+
+
+@pytest.fixture
+def fake_vision(monkeypatch):
+    built = []
+
+    def make_client(credentials=None):
+        built.append(FakeClient(credentials))
+        return built[-1]
+
+    sdk = SimpleNamespace(
+        Image=lambda content: SimpleNamespace(content=content),
+        Feature=_Feature,
+        AnnotateImageRequest=lambda image, features: SimpleNamespace(image=image, features=features),
+        ImageAnnotatorClient=make_client,
+    )
+    monkeypatch.setattr(ocr, "vision", sdk)
+    monkeypatch.setattr(ocr, "_CLIENT", None)
+    monkeypatch.setattr(ocr, "_make_creds", lambda: "creds")
+    return built
+
+
+def test_batch_ocr_sends_up_to_16_pages_per_request(fake_vision):
+    pages = [f"page {i}".encode() for i in range(18)]
+    pages[3] = b"bad"
+
+    results = ocr.google_vision_batch_image_bytes_with_layout(pages)
+
+    assert fake_vision[0].batch_sizes == [16, 2]
+    assert [text for text, _, _ in results] == [("" if p == b"bad" else p.decode()) for p in pages]
+    assert results[3][2] == "Vision error: bad page"
+    assert results[0][1] == {"pages": []}
+
+
+def test_vision_client_is_built_once_and_shared(fake_vision):
+    assert ocr.google_vision_image_bytes(b"first") == ("first", None)
+    assert ocr.google_vision_image_bytes_with_layout(b"second")[0] == "second"
+
+    assert len(fake_vision) == 1
+    assert fake_vision[0].credentials == "creds"
+    assert fake_vision[0].single_calls == 2
+
+
+def test_missing_or_invalid_credentials_are_not_cached(fake_vision, monkeypatch):
+    monkeypatch.setattr(ocr, "_make_creds", lambda: None)
+    assert ocr.google_vision_image_bytes(b"x") == ("", "GOOGLE_APPLICATION_CREDENTIALS not set")
+
+    def broken_creds():
+        raise ValueError("bad key file")
+
+    monkeypatch.setattr(ocr, "_make_creds", broken_creds)
+    assert ocr.google_vision_image_bytes(b"x") == ("", "Invalid Google credentials: bad key file")
+    assert fake_vision == []
+
+    # once the configuration is fixed the client is built
+    monkeypatch.setattr(ocr, "_make_creds", lambda: "creds")
+    assert ocr.google_vision_image_bytes(b"x") == ("x", None)
+    assert len(fake_vision) == 1
+
+
+def test_pages_fall_back_to_concurrent_single_requests(fake_vision, monkeypatch):
+    client = FakeClient("creds", fail_batch=True)
+    monkeypatch.setattr(ocr, "_CLIENT", client)
+    pages = [f"page {i}".encode() for i in range(6)]
+
+    results = ocr._ocr_pages_with_layout(pages)
+
+    assert [text for text, _, _ in results] == [p.decode() for p in pages]
+    assert all(err is None for _, _, err in results)
+    assert client.single_calls == len(pages)
@@ -0,0 +1,14 @@
+from app.parser import parse_text
+from tests.test_parser_os_duplication import SAMPLE_OCR
+
+
+def test_memoized_parse_returns_independent_results():
+    first = parse_text("file-a", SAMPLE_OCR)
+    first.od.k1 = "99.99"
+    first.flags.append("edited")
+
+    second = parse_text("file-b", SAMPLE_OCR)
+    assert second.file_id == "file-b"
+    assert second.od.k1 != "99.99"
+    assert "edited" not in second.flags
+    assert second.text_hash == first.text_hash
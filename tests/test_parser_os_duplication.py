@@ -109,3 +109,10 @@ def test_parser_skips_os_when_missing():
     assert res.confidence.get("os.k1_axis", None) == 0.0
     assert res.confidence.get("os.k2_axis", None) == 0.0
 
+
+
+def test_llm_merge_ignores_unknown_keys():
+    # a stray key from the LLM (legacy single 'axis') must not discard the fields next to it
+    res = parse_text("test-file", SAMPLE_OCR,
+                     llm_func=lambda text, missing: {"od": {"axis": "90", "axial_length": "23.50"}})
+    assert res.od.axial_length == "23.50"